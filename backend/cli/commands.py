@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import click
 from rich.console import Console
+from sqlalchemy.orm import undefer
 
 from backend.database.models import get_session, AIInteraction, ProjectMilestone, NextStep
 from backend.services.git_monitor import GitMonitor
@@ -127,17 +128,17 @@ def stats(repo_path: str):
 
 
 @cli.command()
-@click.argument('repo_path', type=click.Path(exists=True))
+@click.argument('repo_paths', nargs=-1, required=True, type=click.Path(exists=True))
 @click.option('--limit', default=50, help='Number of recent commits to scan')
-def sync(repo_path: str, limit: int):
-    """Sync a repository to capture new commits."""
+def sync(repo_paths: tuple, limit: int):
+    """Sync one or more repositories to capture new commits."""
     db_session = get_session()
     monitor = GitMonitor(db_session)
 
     try:
-        commits = monitor.scan_repo(repo_path, limit=limit)
+        commits = monitor.scan_repos(list(repo_paths), limit=limit)
         if commits:
-            console.print(f"[green]✓[/green] Synced {len(commits)} new commits from {repo_path}")
+            console.print(f"[green]✓[/green] Synced {len(commits)} new commits from {', '.join(repo_paths)}")
         else:
             console.print("[dim]No new commits found.[/dim]")
 
@@ -486,7 +487,10 @@ def sessions(repo: str = None, limit: int = 10):
     from backend.services.ai_tracker import AITracker
     tracker = AITracker(db_session)
 
-    query = db_session.query(AIInteraction).filter_by(is_session=1)
+    # Status column checks the transcript, so load it with the rows
+    query = db_session.query(AIInteraction).options(
+        undefer(AIInteraction.session_transcript)
+    ).filter_by(is_session=1)
 
     # Filter by repo if specified
     if repo:
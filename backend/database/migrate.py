@@ -1,319 +1,644 @@
 """Database migration utilities."""
 
+import logging
+import os
 import sqlite3
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
+log = logging.getLogger(__name__)
 
-def migrate_v1_to_v2(db_path: str = None):
-    """Migrate database from v1 (Phase 1) to v2 (Phase 2 with sessions).
+# Rows cleared per UPDATE when moving transcripts out of the database (v6)
+TRANSCRIPT_BATCH_SIZE = 500
 
-    Adds session support columns to ai_interactions table.
-    """
-    if db_path is None:
-        home = Path.home()
-        db_path = home / ".ai-session" / "sessions.db"
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+def _load_schema(cursor) -> dict:
+    """Read the current schema once so every migration can share it.
 
-    # Check if columns already exist
-    cursor.execute("PRAGMA table_info(ai_interactions)")
-    columns = [row[1] for row in cursor.fetchall()]
+    Args:
+        cursor: Open sqlite3 cursor
 
-    migrations_needed = []
+    Returns:
+        Dict with 'ai_interactions_columns', 'tables' and 'indexes' sets
+    """
+    # Iterate the cursor directly rather than materializing fetchall() lists
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(ai_interactions)")}
+    tables = set()
+    indexes = set()
+    for name, kind in cursor.execute("SELECT name, type FROM sqlite_master WHERE type IN ('table', 'index')"):
+        (tables if kind == 'table' else indexes).add(name)
 
-    if 'is_session' not in columns:
-        migrations_needed.append(
-            "ALTER TABLE ai_interactions ADD COLUMN is_session INTEGER DEFAULT 0"
-        )
+    return {'ai_interactions_columns': columns, 'tables': tables, 'indexes': indexes}
 
-    if 'session_transcript' not in columns:
-        migrations_needed.append(
-            "ALTER TABLE ai_interactions ADD COLUMN session_transcript TEXT"
-        )
 
-    if 'summary_generated' not in columns:
-        migrations_needed.append(
-            "ALTER TABLE ai_interactions ADD COLUMN summary_generated INTEGER DEFAULT 0"
-        )
+def _execute_batch(cursor, statements: list):
+    """Run a version's DDL statements as a single script in one transaction.
+
+    Args:
+        cursor: Cursor on a connection opened with isolation_level=None
+        statements: SQL statements to execute
+    """
+    sql = ";\n".join(statements) + ";"
+    cursor.executescript(f"BEGIN;\n{sql}\nCOMMIT;")
 
-    if not migrations_needed:
-        print("✅ Database is up to date")
-        conn.close()
-        return
 
-    print(f"📝 Running {len(migrations_needed)} migrations...")
+@dataclass
+class Migration:
+    """A single schema version step.
 
-    for migration in migrations_needed:
-        print(f"  - {migration.split('ADD COLUMN')[1].split()[0] if 'ADD COLUMN' in migration else 'unknown'}")
-        cursor.execute(migration)
+    Columns are added with ALTER TABLE when missing; tables (and their indexes)
+    are created when missing. A migration without tables adds its indexes to
+    existing tables instead. post_sql runs afterwards for data migrations.
 
-    conn.commit()
-    conn.close()
+    Data migrations that delete or rewrite user data set run_on_open=False:
+    they only run from the explicit migrate command, never implicitly when
+    Chronicle opens the database. On open, their open_sql (if any) runs
+    instead and reports whether it completed the step without that.
+    """
 
-    print("✅ Migration complete!")
+    version: int
+    description: str
+    columns_to_add: List[Tuple[str, str, str]] = field(default_factory=list)  # (column, table, definition)
+    tables_to_add: List[Tuple[str, str]] = field(default_factory=list)  # (table, CREATE TABLE sql)
+    indexes: List[Tuple[str, str]] = field(default_factory=list)  # (index, CREATE INDEX sql)
+    post_sql: Optional[Callable[[sqlite3.Connection], bool]] = None  # returns True to request compaction
+    run_on_open: bool = True
+    open_sql: Optional[Callable[[sqlite3.Connection], bool]] = None  # returns True if the step is complete
 
 
-def migrate_v2_to_v3(db_path: str = None):
-    """Migrate database from v2 to v3 (add repo tracking).
+def _apply_migration(conn: sqlite3.Connection, migration: Migration, schema: dict) -> bool:
+    """Apply one registry entry, skipping anything the schema already has.
 
-    Adds working_directory and repo_path columns to ai_interactions table.
-    """
-    if db_path is None:
-        home = Path.home()
-        db_path = home / ".ai-session" / "sessions.db"
+    Args:
+        conn: Connection in autocommit mode
+        migration: Migration to apply
+        schema: Shared schema dict from _load_schema(), updated in place
 
-    conn = sqlite3.connect(db_path)
+    Returns:
+        True if the database should be compacted once all migrations have run
+    """
     cursor = conn.cursor()
+    migrations_needed = []
+    new_columns = []
+    new_tables = []
 
-    # Check if columns already exist
-    cursor.execute("PRAGMA table_info(ai_interactions)")
-    columns = [row[1] for row in cursor.fetchall()]
+    for column, table, definition in migration.columns_to_add:
+        if column not in schema[f'{table}_columns']:
+            migrations_needed.append(
+                (column, f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            )
+            new_columns.append((table, column))
 
-    migrations_needed = []
+    for table, sql in migration.tables_to_add:
+        if table not in schema['tables']:
+            migrations_needed.append((f"Creating table: {table}", sql))
+            new_tables.append(table)
 
-    if 'working_directory' not in columns:
-        migrations_needed.append(
-            "ALTER TABLE ai_interactions ADD COLUMN working_directory TEXT"
-        )
+    # Indexes of table-creating migrations belong to the new tables, so only
+    # build them alongside those; index-only migrations target existing tables
+    new_indexes = []
+    if new_tables or not migration.tables_to_add:
+        for index, sql in migration.indexes:
+            if new_tables or index not in schema['indexes']:
+                migrations_needed.append((f"Creating index: {index}", sql))
+                new_indexes.append(index)
 
-    if 'repo_path' not in columns:
-        migrations_needed.append(
-            "ALTER TABLE ai_interactions ADD COLUMN repo_path TEXT"
-        )
+    if migrations_needed:
+        log.info("Running %d migrations to v%d (%s)...", len(migrations_needed), migration.version, migration.description)
 
-    if not migrations_needed:
-        print("✅ Database is already at v3")
-        conn.close()
-        return
+        for name, _ in migrations_needed:
+            log.info("  - %s", name)
 
-    print(f"📝 Running {len(migrations_needed)} migrations to v3...")
+        _execute_batch(cursor, [sql for _, sql in migrations_needed])
 
-    for migration in migrations_needed:
-        print(f"  - {migration.split('ADD COLUMN')[1].split()[0] if 'ADD COLUMN' in migration else 'unknown'}")
-        cursor.execute(migration)
+        # Keep the shared schema in sync instead of re-querying it
+        for table, column in new_columns:
+            schema[f'{table}_columns'].add(column)
+        schema['tables'].update(new_tables)
+        schema['indexes'].update(new_indexes)
 
-    conn.commit()
-    conn.close()
+        log.info("Migration to v%d complete", migration.version)
+    elif migration.post_sql is None:
+        log.info("Database is already at v%d", migration.version)
 
-    print("✅ Migration to v3 complete!")
+    if migration.post_sql is not None:
+        return migration.post_sql(conn)
+    return False
 
 
-def migrate_v3_to_v4(db_path: str = None):
-    """Migrate database from v3 to v4 (add project tracking).
+def _move_transcripts_to_files(conn: sqlite3.Connection) -> bool:
+    """Move transcripts from the database to files (v5 → v6).
 
-    Adds project_milestones and next_steps tables for meta-development tracking.
-    """
-    if db_path is None:
-        home = Path.home()
-        db_path = home / ".ai-session" / "sessions.db"
+    NULLs out session_transcript column to free up database space.
+    Transcripts are now stored in .cleaned files in ~/.ai-session/sessions/
+
+    This dramatically reduces database size (110MB → ~10MB for 13 sessions).
 
-    conn = sqlite3.connect(db_path)
+    Returns:
+        True if transcripts were cleared and the database should be compacted
+    """
     cursor = conn.cursor()
 
-    # Check if tables already exist
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    existing_tables = [row[0] for row in cursor.fetchall()]
+    # Check current database size
+    cursor.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
+    size_before = cursor.fetchone()[0]
+    size_before_mb = size_before / 1024 / 1024
 
-    migrations_needed = []
+    # Count sessions with transcripts in database
+    cursor.execute("SELECT COUNT(*) FROM ai_interactions WHERE session_transcript IS NOT NULL AND is_session = 1")
+    count = cursor.fetchone()[0]
 
-    if 'project_milestones' not in existing_tables:
-        migrations_needed.append("""
-            CREATE TABLE project_milestones (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                created_at DATETIME NOT NULL,
-                title VARCHAR(255) NOT NULL,
-                description TEXT,
-                status VARCHAR(50) NOT NULL DEFAULT 'planned',
-                milestone_type VARCHAR(50) NOT NULL DEFAULT 'feature',
-                priority INTEGER DEFAULT 3,
-                completed_at DATETIME,
-                related_sessions TEXT,
-                related_commits TEXT,
-                tags TEXT
-            )
-        """)
-        migrations_needed.append(
-            "CREATE INDEX ix_project_milestones_created_at ON project_milestones (created_at)"
-        )
-        migrations_needed.append(
-            "CREATE INDEX ix_project_milestones_status ON project_milestones (status)"
+    if count == 0:
+        log.info("Database is already at v6 (no transcripts in database)")
+        log.info("   Current size: %.1f MB", size_before_mb)
+        return False
+
+    log.info("Migration v5 -> v6: Moving transcripts from database to files...")
+    log.info("   Database size: %.1f MB", size_before_mb)
+    log.info("   Sessions with transcripts in DB: %d", count)
+
+    # NULL out session transcripts in small batches. Each batch commits on its own
+    # (autocommit mode) and the WAL is truncated in between, so the journal stays
+    # bounded and an interrupted run simply resumes where it left off.
+    while True:
+        cursor.execute(
+            "UPDATE ai_interactions SET session_transcript = NULL WHERE rowid IN ("
+            "SELECT rowid FROM ai_interactions "
+            "WHERE is_session = 1 AND session_transcript IS NOT NULL LIMIT ?)",
+            (TRANSCRIPT_BATCH_SIZE,)
         )
+        if cursor.rowcount == 0:
+            break
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
 
-    if 'next_steps' not in existing_tables:
-        migrations_needed.append("""
-            CREATE TABLE next_steps (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                created_at DATETIME NOT NULL,
-                description TEXT NOT NULL,
-                priority INTEGER DEFAULT 3,
-                estimated_effort VARCHAR(50),
-                category VARCHAR(50) DEFAULT 'feature',
-                created_by VARCHAR(100),
-                completed INTEGER DEFAULT 0,
-                completed_at DATETIME,
-                related_milestone_id INTEGER,
-                FOREIGN KEY (related_milestone_id) REFERENCES project_milestones (id)
-            )
-        """)
-        migrations_needed.append(
-            "CREATE INDEX ix_next_steps_created_at ON next_steps (created_at)"
-        )
+    log.info("Migration to v6 complete")
+    log.info("   Transcripts now stored in ~/.ai-session/sessions/*.cleaned files")
 
-    if not migrations_needed:
-        print("✅ Database is already at v4")
-        conn.close()
-        return
+    # Reclaiming the freed pages happens once the whole chain has finished
+    return True
 
-    print(f"📝 Running {len(migrations_needed)} migrations to v4 (project tracking)...")
 
-    for migration in migrations_needed:
-        if 'CREATE TABLE' in migration:
-            table_name = migration.split('CREATE TABLE')[1].split()[0].strip()
-            print(f"  - Creating table: {table_name}")
-        elif 'CREATE INDEX' in migration:
-            index_name = migration.split('CREATE INDEX')[1].split()[0].strip()
-            print(f"  - Creating index: {index_name}")
-        cursor.execute(migration)
+def _no_inline_transcripts(conn: sqlite3.Connection) -> bool:
+    """Check whether v6 has nothing to do (no transcripts stored inline).
 
-    conn.commit()
-    conn.close()
+    Returns:
+        True if no session keeps its transcript in the database
+    """
+    return not conn.execute(
+        "SELECT EXISTS (SELECT 1 FROM ai_interactions "
+        "WHERE is_session = 1 AND session_transcript IS NOT NULL)"
+    ).fetchone()[0]
 
-    print("✅ Migration to v4 complete!")
-    print("   New tables: project_milestones, next_steps")
 
+def _dedupe_commits(conn: sqlite3.Connection) -> bool:
+    """Enforce one row per (sha, repo_path) in commits (v8 → v9).
 
-def migrate_v4_to_v5(db_path: str = None):
-    """Migrate database from v4 to v5 (add Gemini model usage tracking).
+    Duplicates left by older scans are removed first, keeping the earliest
+    row and pointing any linked AI interactions at it, then the unique index
+    is created.
 
-    Adds gemini_model_usage table for tracking daily API usage across models.
+    Returns:
+        False (nothing large enough to warrant compaction is deleted)
     """
-    if db_path is None:
-        home = Path.home()
-        db_path = home / ".ai-session" / "sessions.db"
-
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    duplicates = cursor.execute(
+        "SELECT COALESCE(SUM(n - 1), 0) FROM ("
+        "SELECT COUNT(*) AS n FROM commits GROUP BY sha, repo_path)"
+    ).fetchone()[0]
+    if duplicates:
+        log.info("Removing %d duplicate commit rows (keeping the earliest of each)", duplicates)
+
+    _execute_batch(cursor, [
+        "CREATE TEMP TABLE commit_keepers AS "
+        "SELECT id, MIN(id) OVER (PARTITION BY sha, repo_path) AS keep_id FROM commits",
+        "UPDATE ai_interactions SET related_commit_id = ("
+        "SELECT keep_id FROM commit_keepers WHERE id = ai_interactions.related_commit_id) "
+        "WHERE related_commit_id IN (SELECT id FROM commit_keepers WHERE id != keep_id)",
+        "DELETE FROM commits WHERE id IN (SELECT id FROM commit_keepers WHERE id != keep_id)",
+        "DROP TABLE commit_keepers",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_commit_sha_repo ON commits (sha, repo_path)",
+    ])
+    return False
+
+
+def _unique_commits_if_clean(conn: sqlite3.Connection) -> bool:
+    """Create the v9 unique index without deleting anything.
+
+    Returns:
+        True if the index exists, False if duplicate commits block it
+    """
+    try:
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_commit_sha_repo ON commits (sha, repo_path)")
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+
+# Indexes no query can use: model_name, status, sha and repo_path lookups
+# are served by composite indexes (ix_commit_repo_ts, uq_commit_sha_repo),
+# and usage lookups filter on DATE(date), not date
+UNUSED_INDEXES = [
+    'ix_gemini_model_usage_model_name',
+    'ix_gemini_model_usage_date',
+    'ix_project_milestones_status',
+    'ix_commits_sha',
+    'ix_commits_repo_path',
+]
+
+
+def _drop_unused_indexes(conn: sqlite3.Connection) -> bool:
+    """Drop indexes superseded by composite ones or unusable by any query (v10 → v11).
+
+    Returns:
+        False (index pages are reused by SQLite, no compaction needed)
+    """
+    _execute_batch(conn.cursor(), [f"DROP INDEX IF EXISTS {index}" for index in UNUSED_INDEXES])
+    return False
 
-    # Check if table already exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    existing_tables = [row[0] for row in cursor.fetchall()]
 
-    migrations_needed = []
+def _compact(conn: sqlite3.Connection, exclusive: bool = False):
+    """VACUUM the database and report how much space was reclaimed.
 
-    if 'gemini_model_usage' not in existing_tables:
-        migrations_needed.append("""
-            CREATE TABLE gemini_model_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                model_name VARCHAR(100) NOT NULL,
-                date DATETIME NOT NULL,
-                request_count INTEGER DEFAULT 0,
-                total_input_tokens INTEGER DEFAULT 0,
-                total_output_tokens INTEGER DEFAULT 0,
-                total_input_characters INTEGER DEFAULT 0,
-                total_output_characters INTEGER DEFAULT 0,
-                updated_at DATETIME
-            )
-        """)
-        migrations_needed.append(
-            "CREATE INDEX ix_gemini_model_usage_model_name ON gemini_model_usage (model_name)"
-        )
-        migrations_needed.append(
-            "CREATE INDEX ix_gemini_model_usage_date ON gemini_model_usage (date)"
-        )
-        migrations_needed.append(
-            "CREATE UNIQUE INDEX ix_gemini_model_usage_model_date ON gemini_model_usage (model_name, date)"
-        )
+    Args:
+        conn: Connection in autocommit mode (stale afterwards if the file was swapped)
+        exclusive: The caller guarantees no other process has the database
+            open, so the compacted copy may be swapped in (see _vacuum_into_and_swap)
+    """
+    size_before = conn.execute(
+        "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+    ).fetchone()[0]
+    size_before_mb = size_before / 1024 / 1024
 
-    if not migrations_needed:
-        print("✅ Database is already at v5")
-        conn.close()
+    log.info("   Vacuuming database to reclaim space...")
+    try:
+        size_after = _vacuum_into_and_swap(conn) if exclusive else _vacuum_in_place(conn)
+    except sqlite3.OperationalError as e:
+        # e.g. another connection is mid-transaction; the space is reclaimed next time
+        log.warning("   Skipped compaction: %s", e)
         return
+    size_after_mb = size_after / 1024 / 1024
+    saved_mb = size_before_mb - size_after_mb
+    saved_pct = (saved_mb / size_before_mb * 100) if size_before_mb > 0 else 0
 
-    print(f"📝 Running {len(migrations_needed)} migrations to v5 (Gemini usage tracking)...")
+    log.info("   New size: %.1f MB (saved %.1f MB, %.1f%% reduction)", size_after_mb, saved_mb, saved_pct)
 
-    for migration in migrations_needed:
-        if 'CREATE TABLE' in migration:
-            table_name = migration.split('CREATE TABLE')[1].split()[0].strip()
-            print(f"  - Creating table: {table_name}")
-        elif 'CREATE INDEX' in migration or 'CREATE UNIQUE INDEX' in migration:
-            index_name = migration.split('INDEX')[1].split()[0].strip()
-            print(f"  - Creating index: {index_name}")
-        cursor.execute(migration)
 
-    conn.commit()
-    conn.close()
+def _vacuum_in_place(conn: sqlite3.Connection) -> int:
+    """Compact the database with a plain VACUUM, safe alongside other connections.
 
-    print("✅ Migration to v5 complete!")
-    print("   New table: gemini_model_usage (tracks API usage by model and date)")
+    Args:
+        conn: Connection to the database in autocommit mode
 
+    Returns:
+        Size of the compacted database in bytes
+    """
+    conn.execute("VACUUM")
+    return conn.execute(
+        "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+    ).fetchone()[0]
 
-def migrate_v5_to_v6(db_path: str = None):
-    """Migrate database from v5 to v6 (move transcripts from database to files).
 
-    NULLs out session_transcript column to free up database space.
-    Transcripts are now stored in .cleaned files in ~/.ai-session/sessions/
+def _vacuum_into_and_swap(conn: sqlite3.Connection) -> int:
+    """Compact the database by writing a fresh copy and renaming it into place.
 
-    This dramatically reduces database size (110MB → ~10MB for 13 sessions).
+    VACUUM INTO builds the compacted copy without rewriting the live file, and
+    os.replace swaps it in atomically. Only safe when no other process has the
+    database open: a connection elsewhere keeps using the replaced file, and
+    anything it writes afterwards is lost. Falls back to an in-place VACUUM if
+    the copy or rename fails. The swap leaves ``conn`` pointing at the old
+    file, so callers must not use it for further writes.
+
+    Args:
+        conn: Connection to the database in autocommit mode
+
+    Returns:
+        Size of the compacted database in bytes
+    """
+    db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+    tmp_path = f"{db_file}.vacuum.tmp"
+
+    try:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn.execute("VACUUM INTO ?", (tmp_path,))
+        # Make sure no WAL content is left behind to be replayed onto the new file
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, db_file)
+        return size
+    except (OSError, sqlite3.Error) as e:
+        log.warning("   Could not swap in the compacted copy (%s); vacuuming in place", e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return _vacuum_in_place(conn)
+
+
+MIGRATIONS = [
+    Migration(
+        version=2,
+        description="session support",
+        columns_to_add=[
+            ('is_session', 'ai_interactions', "INTEGER NOT NULL DEFAULT 0"),
+            ('session_transcript', 'ai_interactions', "TEXT"),
+            ('summary_generated', 'ai_interactions', "INTEGER NOT NULL DEFAULT 0"),
+        ],
+    ),
+    Migration(
+        version=3,
+        description="repo tracking",
+        columns_to_add=[
+            ('working_directory', 'ai_interactions', "VARCHAR(500)"),
+            ('repo_path', 'ai_interactions', "VARCHAR(500)"),
+        ],
+    ),
+    Migration(
+        version=4,
+        description="project tracking",
+        tables_to_add=[
+            ('project_milestones', """
+                CREATE TABLE IF NOT EXISTS project_milestones (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at DATETIME NOT NULL,
+                    title VARCHAR(255) NOT NULL,
+                    description TEXT,
+                    status VARCHAR(50) NOT NULL DEFAULT 'planned',
+                    milestone_type VARCHAR(50) NOT NULL DEFAULT 'feature',
+                    priority INTEGER DEFAULT 3,
+                    completed_at DATETIME,
+                    related_sessions TEXT,
+                    related_commits TEXT,
+                    tags TEXT
+                )
+            """),
+            ('next_steps', """
+                CREATE TABLE IF NOT EXISTS next_steps (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at DATETIME NOT NULL,
+                    description TEXT NOT NULL,
+                    priority INTEGER DEFAULT 3,
+                    estimated_effort VARCHAR(50),
+                    category VARCHAR(50) DEFAULT 'feature',
+                    created_by VARCHAR(100),
+                    completed INTEGER DEFAULT 0,
+                    completed_at DATETIME,
+                    related_milestone_id INTEGER,
+                    FOREIGN KEY (related_milestone_id) REFERENCES project_milestones (id)
+                )
+            """),
+        ],
+        indexes=[
+            ('ix_project_milestones_created_at',
+             "CREATE INDEX IF NOT EXISTS ix_project_milestones_created_at ON project_milestones (created_at)"),
+            ('ix_next_steps_created_at',
+             "CREATE INDEX IF NOT EXISTS ix_next_steps_created_at ON next_steps (created_at)"),
+        ],
+    ),
+    Migration(
+        version=5,
+        description="Gemini usage tracking",
+        tables_to_add=[
+            ('gemini_model_usage', """
+                CREATE TABLE IF NOT EXISTS gemini_model_usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model_name VARCHAR(100) NOT NULL,
+                    date DATETIME NOT NULL,
+                    request_count INTEGER DEFAULT 0,
+                    total_input_tokens INTEGER DEFAULT 0,
+                    total_output_tokens INTEGER DEFAULT 0,
+                    total_input_characters INTEGER DEFAULT 0,
+                    total_output_characters INTEGER DEFAULT 0,
+                    updated_at DATETIME
+                )
+            """),
+        ],
+        indexes=[
+            # The unique (model_name, date) index also serves model_name prefix lookups
+            ('ix_gemini_model_usage_model_date',
+             "CREATE UNIQUE INDEX IF NOT EXISTS ix_gemini_model_usage_model_date "
+             "ON gemini_model_usage (model_name, date)"),
+        ],
+    ),
+    Migration(
+        version=6,
+        description="transcripts moved to files",
+        post_sql=_move_transcripts_to_files,
+        # Clears inline transcripts; only from the explicit migrate command
+        run_on_open=False,
+        open_sql=_no_inline_transcripts,
+    ),
+    Migration(
+        version=7,
+        description="composite query indexes",
+        indexes=[
+            # (filter, timestamp) pairs let ORDER BY timestamp DESC LIMIT N range-scan without sorting
+            ('ix_ai_session_ts',
+             "CREATE INDEX IF NOT EXISTS ix_ai_session_ts ON ai_interactions (is_session, timestamp)"),
+            ('ix_ai_tool_ts',
+             "CREATE INDEX IF NOT EXISTS ix_ai_tool_ts ON ai_interactions (ai_tool, timestamp)"),
+            ('ix_ai_repo_ts',
+             "CREATE INDEX IF NOT EXISTS ix_ai_repo_ts ON ai_interactions (repo_path, timestamp)"),
+            ('ix_commit_repo_ts',
+             "CREATE INDEX IF NOT EXISTS ix_commit_repo_ts ON commits (repo_path, timestamp)"),
+            ('ix_commit_author_ts',
+             "CREATE INDEX IF NOT EXISTS ix_commit_author_ts ON commits (author, timestamp)"),
+        ],
+    ),
+    Migration(
+        version=8,
+        description="roadmap indexes",
+        indexes=[
+            # get_roadmap / get_next_steps filter on status/completed and sort by priority
+            ('ix_milestone_status_priority',
+             "CREATE INDEX IF NOT EXISTS ix_milestone_status_priority ON project_milestones (status, priority)"),
+            ('ix_nextstep_completed_priority',
+             "CREATE INDEX IF NOT EXISTS ix_nextstep_completed_priority ON next_steps (completed, priority)"),
+        ],
+    ),
+    Migration(
+        version=9,
+        description="unique commits per repository",
+        # Duplicates have to go before the unique index can be built
+        post_sql=_dedupe_commits,
+        # Deletes rows; on open only build the index if nothing needs deleting
+        run_on_open=False,
+        open_sql=_unique_commits_if_clean,
+    ),
+    Migration(
+        version=10,
+        description="session metadata in the database",
+        columns_to_add=[
+            ('session_metadata', 'ai_interactions', "TEXT"),
+        ],
+    ),
+    Migration(
+        version=11,
+        description="drop unused indexes",
+        post_sql=_drop_unused_indexes,
+    ),
+]
+
+
+def _open_default(db_path: str = None) -> sqlite3.Connection:
+    """Open the Chronicle database for migrations.
+
+    Args:
+        db_path: Path to SQLite database file. Defaults to ~/.ai-session/sessions.db
+
+    Returns:
+        sqlite3 connection in autocommit mode
     """
     if db_path is None:
         home = Path.home()
         db_path = home / ".ai-session" / "sessions.db"
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Shared cache lets any other connection opened during the run reuse warm pages
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=rwc&cache=shared"
+    return sqlite3.connect(uri, uri=True, isolation_level=None)  # autocommit mode
 
-    # Check current database size
-    cursor.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
-    size_before = cursor.fetchone()[0]
-    size_before_mb = size_before / 1024 / 1024
 
-    # Count sessions with transcripts in database
-    cursor.execute("SELECT COUNT(*) FROM ai_interactions WHERE session_transcript IS NOT NULL AND is_session = 1")
-    count = cursor.fetchone()[0]
+def run_migrations(conn: sqlite3.Connection, exclusive: bool = False, on_open: bool = False):
+    """Apply every registered migration newer than the database's user_version.
 
-    if count == 0:
-        print(f"✅ Database is already at v6 (no transcripts in database)")
-        print(f"   Current size: {size_before_mb:.1f} MB")
-        conn.close()
+    PRAGMA user_version records the last applied migration, so an up-to-date
+    database costs a single pragma read. Databases that predate user_version
+    (version 0) fall back to probing the schema once, shared across migrations.
+
+    Args:
+        conn: Connection in autocommit mode
+        exclusive: No other process has the database open (enables the
+            faster file-swap compaction)
+        on_open: Running implicitly as Chronicle opens the database. Steps
+            with run_on_open=False are left for the explicit migrate command,
+            and user_version stays below the first one skipped.
+    """
+    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    pending = [m for m in MIGRATIONS if m.version > current_version]
+
+    if not pending:
+        log.info("Database is up to date (v%d)", current_version)
         return
 
-    print(f"📝 Migration v5 → v6: Moving transcripts from database to files...")
-    print(f"   Database size: {size_before_mb:.1f} MB")
-    print(f"   Sessions with transcripts in DB: {count}")
+    schema = _load_schema(conn.cursor())
+    needs_compaction = False
+
+    skipped = False
+    for migration in pending:
+        if on_open and not migration.run_on_open:
+            if migration.open_sql is None or not migration.open_sql(conn):
+                log.warning(
+                    "Database migration v%d (%s) changes existing data and was not applied; "
+                    "run 'python -m backend.database.migrate' to apply it",
+                    migration.version, migration.description,
+                )
+                skipped = True
+        else:
+            needs_compaction |= _apply_migration(conn, migration, schema)
+
+        # Later additive steps still apply, but the recorded version must not
+        # pass a skipped step or the migrate command would never run it
+        if not skipped:
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+
+    # Refresh planner statistics for the new tables/indexes (carried over by VACUUM INTO)
+    conn.execute("PRAGMA analysis_limit=1000")
+    conn.execute("PRAGMA optimize")
+
+    # Compaction may swap the database file, so it must be the last step
+    if needs_compaction:
+        _compact(conn, exclusive)
+
+
+def migrate_if_needed(db_path: str):
+    """Bring an existing database up to the latest schema before it is used.
+
+    Called by init_db whenever Chronicle opens a database, so schema
+    upgrades do not depend on running this module by hand. Steps that change
+    existing data are skipped (see Migration.run_on_open). Other Chronicle
+    processes may have the database open at the same time, so compaction
+    vacuums in place.
+
+    Args:
+        db_path: Path to an existing SQLite database file
+    """
+    conn = _open_default(db_path)
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= MIGRATIONS[-1].version:
+            return
+
+        try:
+            run_migrations(conn, on_open=True)
+        except sqlite3.OperationalError:
+            # Another process applied part of the upgrade first (e.g. the column
+            # already exists); re-probe the schema and finish from there
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            run_migrations(conn, on_open=True)
+    finally:
+        conn.close()
 
-    # NULL out all session transcripts
-    cursor.execute("UPDATE ai_interactions SET session_transcript = NULL WHERE is_session = 1")
-    conn.commit()
-    conn.close()
 
-    # VACUUM to reclaim space (must be outside transaction)
-    print(f"   Vacuuming database to reclaim space...")
-    conn = sqlite3.connect(db_path, isolation_level=None)  # autocommit mode
-    cursor = conn.cursor()
-    cursor.execute("VACUUM")
-    conn.close()
+def _create_fresh_schema(db_path: Path):
+    """Create a new database directly at the latest schema version.
+
+    Args:
+        db_path: Path to the (missing or empty) SQLite database file
+    """
+    from backend.database.models import init_db
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # init_db stamps new databases with the latest user_version
+    engine, _ = init_db(str(db_path))
+    engine.dispose()
+
+    log.info("Created new database at v%d", MIGRATIONS[-1].version)
 
-    # Check new size
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute("SELECT page_count * page_size as size FROM pragma_page_count(), pragma_page_size()")
-    size_after = cursor.fetchone()[0]
-    size_after_mb = size_after / 1024 / 1024
-    saved_mb = size_before_mb - size_after_mb
-    saved_pct = (saved_mb / size_before_mb * 100) if size_before_mb > 0 else 0
 
-    conn.close()
+def run_all_migrations(db_path: str = None, exclusive: bool = False):
+    """Open the database and run every migration in order.
 
-    print(f"✅ Migration to v6 complete!")
-    print(f"   New size: {size_after_mb:.1f} MB (saved {saved_mb:.1f} MB, {saved_pct:.1f}% reduction)")
-    print(f"   Transcripts now stored in ~/.ai-session/sessions/*.cleaned files")
+    Fresh installs (no database file, or an empty one) skip the migration
+    chain and get the latest schema created directly.
+
+    Args:
+        db_path: Path to SQLite database file. Defaults to ~/.ai-session/sessions.db
+        exclusive: The caller guarantees no other Chronicle process (MCP
+            server, recorder) has the database open. Compaction then swaps in
+            a fresh copy instead of vacuuming in place.
+    """
+    if db_path is None:
+        home = Path.home()
+        db_path = home / ".ai-session" / "sessions.db"
+
+    db_file = Path(db_path)
+    if not db_file.exists() or db_file.stat().st_size == 0:
+        _create_fresh_schema(db_file)
+        return
+
+    conn = _open_default(db_path)
+    try:
+        run_migrations(conn, exclusive)
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
-    print("Running all migrations...")
-    migrate_v1_to_v2()
-    migrate_v2_to_v3()
-    migrate_v3_to_v4()
-    migrate_v4_to_v5()
-    migrate_v5_to_v6()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run Chronicle database migrations.")
+    parser.add_argument(
+        "--exclusive", action="store_true",
+        help="no other Chronicle process (MCP server, recorder) has the database open; "
+             "allows compacting by swapping in a fresh copy",
+    )
+    args = parser.parse_args()
+
+    # Progress output is only useful interactively; stay quiet under cron/pipes
+    logging.basicConfig(
+        level=logging.INFO if sys.stdout.isatty() else logging.WARNING,
+        format="%(message)s",
+    )
+    log.info("Running all migrations...")
+    run_all_migrations(exclusive=args.exclusive)
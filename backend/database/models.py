@@ -1,27 +1,76 @@
 """SQLAlchemy models for AI Session Recorder."""
 
+import functools
+import os
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, create_engine
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, case, create_engine, event, func, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
-import json
+from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.orm import column_property, deferred, sessionmaker, relationship, synonym
+from sqlalchemy.types import TypeDecorator
+import orjson
+
+from backend.database.migrate import MIGRATIONS, migrate_if_needed
 
 Base = declarative_base()
 
 
+class JSONList(TypeDecorator):
+    """List stored as a JSON array in a Text column.
+
+    Decoding happens once when the row is loaded, so repeated attribute
+    access returns the same Python list instead of re-parsing the JSON.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return orjson.dumps(value or []).decode()
+
+    def process_result_value(self, value, dialect):
+        return orjson.loads(value) if value else []
+
+
+# Track in-place edits (append/remove) so they are flushed like reassignments
+JSONListColumn = MutableList.as_mutable(JSONList)
+
+
+class JSONDict(TypeDecorator):
+    """Dict stored as a JSON object in a Text column (NULL when unset)."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return orjson.dumps(value).decode() if value is not None else None
+
+    def process_result_value(self, value, dialect):
+        return orjson.loads(value) if value else None
+
+
 class Commit(Base):
     """Git commit tracking."""
 
     __tablename__ = 'commits'
+    __table_args__ = (
+        Index('ix_commit_repo_ts', 'repo_path', 'timestamp'),
+        Index('ix_commit_author_ts', 'author', 'timestamp'),
+        # A commit is stored once per repository; also serves sha lookups
+        Index('uq_commit_sha_repo', 'sha', 'repo_path', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, nullable=False, index=True)
-    sha = Column(String(40), nullable=False, index=True)
+    sha = Column(String(40), nullable=False)  # Indexed via uq_commit_sha_repo
     message = Column(Text, nullable=False)
-    files_changed = Column(Text)  # JSON array
+    files_changed = Column(JSONListColumn)  # JSON array
     branch = Column(String(255))
     author = Column(String(255))
-    repo_path = Column(String(500), nullable=False, index=True)
+    repo_path = Column(String(500), nullable=False)  # Indexed via ix_commit_repo_ts
+
+    # List-valued aliases kept for existing callers
+    files_list = synonym('files_changed')
 
     # Relationship to AI interactions
     ai_interactions = relationship("AIInteraction", back_populates="commit")
@@ -29,60 +78,54 @@ class Commit(Base):
     def __repr__(self):
         return f"<Commit(sha='{self.sha[:8]}', message='{self.message[:50]}')>"
 
-    @property
-    def files_list(self):
-        """Get files_changed as a Python list."""
-        if self.files_changed:
-            return json.loads(self.files_changed)
-        return []
-
-    @files_list.setter
-    def files_list(self, value):
-        """Set files_changed from a Python list."""
-        self.files_changed = json.dumps(value)
-
 
 class AIInteraction(Base):
     """AI tool interaction tracking."""
 
     __tablename__ = 'ai_interactions'
+    __table_args__ = (
+        # Match the MCP filters so ORDER BY timestamp DESC LIMIT N needs no sort
+        Index('ix_ai_session_ts', 'is_session', 'timestamp'),
+        Index('ix_ai_tool_ts', 'ai_tool', 'timestamp'),
+        Index('ix_ai_repo_ts', 'repo_path', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, nullable=False, index=True)
     ai_tool = Column(String(50), nullable=False)  # 'claude-code', 'gemini-cli', 'qwen-cli'
     prompt = Column(Text, nullable=False)
     response_summary = Column(Text)  # First 500 chars or AI-generated summary
-    files_mentioned = Column(Text)  # JSON array
+    files_mentioned = Column(JSONListColumn)  # JSON array
     duration_ms = Column(Integer)
     related_commit_id = Column(Integer, ForeignKey('commits.id'))
 
+    # Rounded in SQL so list queries get it precomputed (NULL when unknown)
+    duration_minutes = column_property(
+        case((duration_ms > 0, func.round(duration_ms / 60000.0, 1)))
+    )
+
     # Session support
-    is_session = Column(Integer, default=0)  # 0 = single interaction, 1 = full session
-    session_transcript = Column(Text)  # Full session transcript for interactive sessions
-    summary_generated = Column(Integer, default=0)  # 0 = not summarized, 1 = summarized
+    is_session = Column(Integer, nullable=False, default=0)  # 0 = single interaction, 1 = full session
+    session_transcript = deferred(Column(Text))  # Legacy inline transcript; loaded only on access
+    summary_generated = Column(Integer, nullable=False, default=0)  # 0 = not summarized, 1 = summarized
+    session_metadata = deferred(Column(JSONDict))  # Recorder bookkeeping (command, transcript file, start time)
 
     # Project/repo tracking
     working_directory = Column(String(500))  # Directory where session was started
     repo_path = Column(String(500))  # Git repository root (if in a git repo)
 
-    # Relationship
-    commit = relationship("Commit", back_populates="ai_interactions")
+    # List-valued aliases kept for existing callers
+    files_list = synonym('files_mentioned')
+
+    # Relationship (selectin: listing interactions loads all linked commits in one IN query)
+    commit = relationship("Commit", back_populates="ai_interactions", lazy="selectin")
+    summary_chunks = relationship(
+        "SessionSummaryChunk", back_populates="session", order_by="SessionSummaryChunk.chunk_number"
+    )
 
     def __repr__(self):
         return f"<AIInteraction(tool='{self.ai_tool}', prompt='{self.prompt[:30]}...')>"
 
-    @property
-    def files_list(self):
-        """Get files_mentioned as a Python list."""
-        if self.files_mentioned:
-            return json.loads(self.files_mentioned)
-        return []
-
-    @files_list.setter
-    def files_list(self, value):
-        """Set files_mentioned from a Python list."""
-        self.files_mentioned = json.dumps(value)
-
 
 class SessionSummaryChunk(Base):
     """Incremental summary chunks for large sessions."""
@@ -98,6 +141,9 @@ class SessionSummaryChunk(Base):
     cumulative_summary = Column(Text, nullable=False)  # Running summary up to this point
     timestamp = Column(DateTime, nullable=False, default=datetime.now)
 
+    # Relationship
+    session = relationship("AIInteraction", back_populates="summary_chunks")
+
     def __repr__(self):
         return f"<SessionSummaryChunk(session_id={self.session_id}, chunk={self.chunk_number})>"
 
@@ -110,60 +156,33 @@ class DailySummary(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     date = Column(DateTime, nullable=False, unique=True, index=True)
     summary = Column(Text, nullable=False)
-    topics = Column(Text)  # JSON array
-    files_affected = Column(Text)  # JSON array
+    topics = Column(JSONListColumn)  # JSON array
+    files_affected = Column(JSONListColumn)  # JSON array
     commits_count = Column(Integer, default=0)
     ai_interactions_count = Column(Integer, default=0)
-    key_decisions = Column(Text)  # JSON array
+    key_decisions = Column(JSONListColumn)  # JSON array
+
+    # List-valued aliases kept for existing callers
+    topics_list = synonym('topics')
+    files_list = synonym('files_affected')
+    decisions_list = synonym('key_decisions')
 
     def __repr__(self):
         return f"<DailySummary(date='{self.date.date()}', commits={self.commits_count})>"
 
-    @property
-    def topics_list(self):
-        """Get topics as a Python list."""
-        if self.topics:
-            return json.loads(self.topics)
-        return []
-
-    @topics_list.setter
-    def topics_list(self, value):
-        """Set topics from a Python list."""
-        self.topics = json.dumps(value)
-
-    @property
-    def files_list(self):
-        """Get files_affected as a Python list."""
-        if self.files_affected:
-            return json.loads(self.files_affected)
-        return []
-
-    @files_list.setter
-    def files_list(self, value):
-        """Set files_affected from a Python list."""
-        self.files_affected = json.dumps(value)
-
-    @property
-    def decisions_list(self):
-        """Get key_decisions as a Python list."""
-        if self.key_decisions:
-            return json.loads(self.key_decisions)
-        return []
-
-    @decisions_list.setter
-    def decisions_list(self, value):
-        """Set key_decisions from a Python list."""
-        self.key_decisions = json.dumps(value)
-
 
 class GeminiModelUsage(Base):
     """Track daily usage of Gemini models to manage rate limits."""
 
     __tablename__ = 'gemini_model_usage'
+    __table_args__ = (
+        # Serves the usage lookups (model_name = ? AND DATE(date) = ?) by model_name
+        Index('ix_gemini_model_usage_model_date', 'model_name', 'date', unique=True),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    model_name = Column(String(100), nullable=False, index=True)
-    date = Column(DateTime, nullable=False, index=True)
+    model_name = Column(String(100), nullable=False)
+    date = Column(DateTime, nullable=False)
     request_count = Column(Integer, default=0)
     total_input_tokens = Column(Integer, default=0)
     total_output_tokens = Column(Integer, default=0)
@@ -179,18 +198,27 @@ class ProjectMilestone(Base):
     """Project milestone/feature tracking for meta-development."""
 
     __tablename__ = 'project_milestones'
+    __table_args__ = (
+        # Also serves status-only lookups
+        Index('ix_milestone_status_priority', 'status', 'priority'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
-    status = Column(String(50), nullable=False, default='planned', index=True)  # planned, in_progress, completed, archived
+    status = Column(String(50), nullable=False, default='planned')  # planned, in_progress, completed, archived
     milestone_type = Column(String(50), nullable=False, default='feature')  # feature, bugfix, optimization, documentation
     priority = Column(Integer, default=3)  # 1 (highest) to 5 (lowest)
     completed_at = Column(DateTime)
-    related_sessions = Column(Text)  # JSON array of session IDs
-    related_commits = Column(Text)  # JSON array of commit SHAs
-    tags = Column(Text)  # JSON array of tags
+    related_sessions = Column(JSONListColumn)  # JSON array of session IDs
+    related_commits = Column(JSONListColumn)  # JSON array of commit SHAs
+    tags = Column(JSONListColumn)  # JSON array of tags
+
+    # List-valued aliases kept for existing callers
+    sessions_list = synonym('related_sessions')
+    commits_list = synonym('related_commits')
+    tags_list = synonym('tags')
 
     # Relationships
     next_steps = relationship("NextStep", back_populates="milestone")
@@ -198,47 +226,14 @@ class ProjectMilestone(Base):
     def __repr__(self):
         return f"<ProjectMilestone(id={self.id}, title='{self.title}', status='{self.status}')>"
 
-    @property
-    def sessions_list(self):
-        """Get related_sessions as a Python list."""
-        if self.related_sessions:
-            return json.loads(self.related_sessions)
-        return []
-
-    @sessions_list.setter
-    def sessions_list(self, value):
-        """Set related_sessions from a Python list."""
-        self.related_sessions = json.dumps(value)
-
-    @property
-    def commits_list(self):
-        """Get related_commits as a Python list."""
-        if self.related_commits:
-            return json.loads(self.related_commits)
-        return []
-
-    @commits_list.setter
-    def commits_list(self, value):
-        """Set related_commits from a Python list."""
-        self.related_commits = json.dumps(value)
-
-    @property
-    def tags_list(self):
-        """Get tags as a Python list."""
-        if self.tags:
-            return json.loads(self.tags)
-        return []
-
-    @tags_list.setter
-    def tags_list(self, value):
-        """Set tags from a Python list."""
-        self.tags = json.dumps(value)
-
 
 class NextStep(Base):
     """Next steps and TODO tracking."""
 
     __tablename__ = 'next_steps'
+    __table_args__ = (
+        Index('ix_nextstep_completed_priority', 'completed', 'priority'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     created_at = Column(DateTime, nullable=False, default=datetime.now, index=True)
@@ -259,9 +254,116 @@ class NextStep(Base):
         return f"<NextStep(id={self.id}, description='{self.description[:50]}...', status='{status}')>"
 
 
+def search_index_matches(index: str, query: str, columns: list = None):
+    """Select the rowids in a full-text search index that match a user query.
+
+    The query is quoted as a single phrase (so FTS5 operators in it are taken
+    literally) and its last word matches as a prefix.
+
+    Args:
+        index: FTS5 table name from SEARCH_INDEXES (e.g. 'ai_fts')
+        query: Raw search text
+        columns: Restrict the match to these indexed columns (default: all)
+
+    Returns:
+        Text selectable with a single integer rowid column, usable in id.in_()
+    """
+    match = '"' + query.replace('"', '""') + '"*'
+    if columns:
+        match = "{" + " ".join(columns) + "} : " + match
+
+    return text(f"SELECT rowid FROM {index} WHERE {index} MATCH :match").bindparams(
+        match=match
+    ).columns(rowid=Integer)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for the read-heavy query workload.
+
+    WAL lets the MCP server read while the recorder writes; the remaining
+    pragmas keep sorts in memory and give each connection a 64 MB page cache
+    and 256 MB of memory-mapped I/O. busy_timeout makes a writer that hits
+    a concurrent write wait up to 5 s instead of failing with "database is
+    locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+# External-content FTS5 indexes over the searchable text columns, kept in sync by triggers
+SEARCH_INDEXES = {
+    'ai_fts': [
+        """CREATE VIRTUAL TABLE ai_fts USING fts5(
+            prompt, response_summary, content='ai_interactions', content_rowid='id'
+        )""",
+        """CREATE TRIGGER ai_fts_insert AFTER INSERT ON ai_interactions BEGIN
+            INSERT INTO ai_fts(rowid, prompt, response_summary)
+            VALUES (new.id, new.prompt, new.response_summary);
+        END""",
+        """CREATE TRIGGER ai_fts_delete AFTER DELETE ON ai_interactions BEGIN
+            INSERT INTO ai_fts(ai_fts, rowid, prompt, response_summary)
+            VALUES ('delete', old.id, old.prompt, old.response_summary);
+        END""",
+        """CREATE TRIGGER ai_fts_update AFTER UPDATE OF prompt, response_summary ON ai_interactions BEGIN
+            INSERT INTO ai_fts(ai_fts, rowid, prompt, response_summary)
+            VALUES ('delete', old.id, old.prompt, old.response_summary);
+            INSERT INTO ai_fts(rowid, prompt, response_summary)
+            VALUES (new.id, new.prompt, new.response_summary);
+        END""",
+    ],
+    'commit_fts': [
+        """CREATE VIRTUAL TABLE commit_fts USING fts5(
+            message, content='commits', content_rowid='id'
+        )""",
+        """CREATE TRIGGER commit_fts_insert AFTER INSERT ON commits BEGIN
+            INSERT INTO commit_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+        """CREATE TRIGGER commit_fts_delete AFTER DELETE ON commits BEGIN
+            INSERT INTO commit_fts(commit_fts, rowid, message) VALUES ('delete', old.id, old.message);
+        END""",
+        """CREATE TRIGGER commit_fts_update AFTER UPDATE OF message ON commits BEGIN
+            INSERT INTO commit_fts(commit_fts, rowid, message) VALUES ('delete', old.id, old.message);
+            INSERT INTO commit_fts(rowid, message) VALUES (new.id, new.message);
+        END""",
+    ],
+}
+
+
+def _create_search_indexes(engine):
+    """Create any missing full-text search tables and index existing rows.
+
+    Args:
+        engine: SQLAlchemy engine for the Chronicle database
+    """
+    with engine.begin() as conn:
+        existing = {
+            row[0] for row in conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%_fts'")
+            )
+        }
+        for table, statements in SEARCH_INDEXES.items():
+            if table in existing:
+                continue
+            for sql in statements:
+                conn.execute(text(sql))
+            # Index rows written before the table existed
+            conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
+
+
 def init_db(db_path: str = None):
     """Initialize the database and create all tables.
 
+    Existing databases are first brought up to date with any pending
+    migrations; new ones are created at the latest schema version. Engines
+    are cached per path, so repeated calls (e.g. from get_session) reuse the
+    same connection pool and only check the schema once.
+
     Args:
         db_path: Path to SQLite database file. Defaults to ~/.ai-session/sessions.db
 
@@ -269,14 +371,38 @@ def init_db(db_path: str = None):
         Tuple of (engine, SessionLocal)
     """
     if db_path is None:
-        import os
         home = os.path.expanduser("~")
         ai_session_dir = os.path.join(home, ".ai-session")
         os.makedirs(ai_session_dir, exist_ok=True)
         db_path = os.path.join(ai_session_dir, "sessions.db")
 
-    engine = create_engine(f'sqlite:///{db_path}', echo=False)
+    return _open_db(str(db_path))
+
+
+@functools.lru_cache(maxsize=8)
+def _open_db(db_path: str):
+    """Create the engine and schema for db_path (cached by init_db)."""
+    is_new = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+    if not is_new:
+        # create_all only adds missing tables; columns, indexes and data
+        # changes on existing tables come from the migrations
+        migrate_if_needed(db_path)
+
+    # Pool sized for concurrent MCP tool calls; idle connections keep their page cache warm
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        echo=False,
+        insertmanyvalues_page_size=1000,
+        pool_size=10,
+        max_overflow=20,
+    )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
     Base.metadata.create_all(engine)
+    _create_search_indexes(engine)
+
+    if is_new:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {MIGRATIONS[-1].version}")
 
     SessionLocal = sessionmaker(bind=engine)
 
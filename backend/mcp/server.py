@@ -4,18 +4,21 @@ This server implements the Model Context Protocol (MCP) to allow AI assistants
 to query Chronicle's database of development sessions, commits, and summaries.
 """
 
+import functools
 import os
-import json
+import time
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+import orjson
 from fastmcp import FastMCP
-from sqlalchemy import desc, or_, and_
-from sqlalchemy.orm import Session, defer
+from sqlalchemy import Boolean, case, desc, or_, and_, func, select, literal, type_coerce, union, union_all
+from sqlalchemy.orm import Session, scoped_session
 
 from backend.database.models import (
     init_db,
+    search_index_matches,
     AIInteraction,
     Commit,
     DailySummary,
@@ -27,52 +30,162 @@ from backend.database.models import (
 # Initialize FastMCP server
 mcp = FastMCP(name="chronicle")
 
-# Database session (will be initialized on first use)
-_db_session: Optional[Session] = None
+# Upper bound on timeline entries returned per requested day
+TIMELINE_ITEMS_PER_DAY = 500
+
+# Timeline rows fetched and hydrated per batch (also bounds each IN list)
+TIMELINE_BATCH_SIZE = 500
+
+# Compact JSON for clients; set CHRONICLE_MCP_PRETTY=1 to indent responses when debugging
+_DUMP_OPTIONS = orjson.OPT_INDENT_2 if os.environ.get("CHRONICLE_MCP_PRETTY") else 0
+
+# Seconds a read-only tool response may be served from cache
+RESPONSE_CACHE_TTL = 5.0
+
+# Where session transcripts are stored (resolved once, not per request)
+SESSIONS_DIR = os.path.join(os.path.expanduser("~"), ".ai-session", "sessions")
+
+# Thread-local session registry (will be initialized on first use)
+_Session: Optional[scoped_session] = None
 
 
 def get_db() -> Session:
-    """Get or create database session."""
-    global _db_session
-    if _db_session is None:
+    """Get the database session for the current thread."""
+    global _Session
+    if _Session is None:
         _, SessionLocal = init_db()
-        _db_session = SessionLocal()
-    return _db_session
-
-
-def format_session_dict(session: AIInteraction) -> Dict[str, Any]:
-    """Convert AIInteraction to a clean dictionary for MCP responses."""
-    return {
-        "id": session.id,
-        "tool": session.ai_tool,
-        "timestamp": session.timestamp.isoformat(),
-        "is_session": bool(session.is_session),
-        "duration_minutes": round(session.duration_ms / 60000, 1) if session.duration_ms else None,
-        "prompt": session.prompt,
-        "summary": session.response_summary,
-        "summary_generated": bool(session.summary_generated),
-        "repo_path": session.repo_path,
-        "working_directory": session.working_directory,
-        "files_mentioned": session.files_list,
-        "related_commit_id": session.related_commit_id,
-    }
+        _Session = scoped_session(SessionLocal)
+    return _Session()
 
 
-def format_commit_dict(commit: Commit) -> Dict[str, Any]:
-    """Convert Commit to a clean dictionary for MCP responses."""
-    return {
-        "id": commit.id,
-        "sha": commit.sha,
-        "timestamp": commit.timestamp.isoformat(),
-        "message": commit.message,
-        "author": commit.author,
-        "branch": commit.branch,
-        "repo_path": commit.repo_path,
-        "files_changed": commit.files_list,
-    }
+def releases_db(func):
+    """Close the calling thread's session once the tool returns.
+
+    Each tool call then starts from a fresh session (and transaction
+    snapshot), and a failed call cannot leave a broken session behind.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if _Session is not None:
+                _Session.remove()
+    return wrapper
+
+
+_response_caches = []
+
+
+def ttl_cache(ttl: float = RESPONSE_CACHE_TTL, maxsize: int = 128):
+    """Memoize a read-only tool's JSON response for a short time.
+
+    Calls are keyed by their arguments plus the current ttl-sized time bucket,
+    so a cached response is never older than ttl seconds. Writes made by the
+    recorder in another process therefore show up within one bucket.
+
+    Args:
+        ttl: Maximum age of a cached response in seconds
+        maxsize: Maximum number of cached responses per tool
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=maxsize)
+        def cached(bucket, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached(int(time.monotonic() / ttl), *args, **kwargs)
+
+        _response_caches.append(cached)
+        return wrapper
+    return decorator
+
+
+def clear_response_cache():
+    """Drop every cached tool response."""
+    for cached in _response_caches:
+        cached.cache_clear()
+
+
+def _dump(obj: Any) -> str:
+    """Serialize an MCP response with orjson (handles datetimes natively)."""
+    return orjson.dumps(obj, default=str, option=_DUMP_OPTIONS).decode()
+
+
+def _repo_filter(column, repo_path: str):
+    """Build an index-friendly repository filter.
+
+    Absolute paths (including ``~``-relative ones) match the repository
+    itself or anything beneath it using an equality/range test the repo_path
+    indexes can seek on. Anything else (e.g. a bare repository name) falls
+    back to a substring match.
+
+    Args:
+        column: repo_path column to filter on
+        repo_path: Repository path or name from the tool call
+
+    Returns:
+        SQLAlchemy filter expression
+    """
+    repo_path = os.path.expanduser(repo_path)
+    if not os.path.isabs(repo_path):
+        return column.like(f"%{repo_path}%")
+
+    root = os.path.normpath(repo_path)
+    # '0' sorts immediately after '/', so this range covers exactly root/...
+    return or_(
+        column == root,
+        and_(column >= root + "/", column < root + "0"),
+    )
+
+
+# (response key, column) pairs the tools select as plain rows, skipping ORM
+# object hydration. Rows come back in this order, already in response shape.
+SESSION_FIELDS = (
+    ("id", AIInteraction.id),
+    ("tool", AIInteraction.ai_tool),
+    ("timestamp", AIInteraction.timestamp),
+    ("is_session", type_coerce(AIInteraction.is_session, Boolean)),
+    ("duration_minutes", AIInteraction.duration_minutes),
+    ("prompt", AIInteraction.prompt),
+    ("summary", AIInteraction.response_summary),
+    ("summary_generated", type_coerce(AIInteraction.summary_generated, Boolean)),
+    ("repo_path", AIInteraction.repo_path),
+    ("working_directory", AIInteraction.working_directory),
+    ("files_mentioned", AIInteraction.files_mentioned),
+    ("related_commit_id", AIInteraction.related_commit_id),
+)
+COMMIT_FIELDS = (
+    ("id", Commit.id),
+    ("sha", Commit.sha),
+    ("timestamp", Commit.timestamp),
+    ("message", Commit.message),
+    ("author", Commit.author),
+    ("branch", Commit.branch),
+    ("repo_path", Commit.repo_path),
+    ("files_changed", Commit.files_changed),
+)
+
+SESSION_KEYS = tuple(key for key, _ in SESSION_FIELDS)
+SESSION_COLUMNS = tuple(column.label(key) for key, column in SESSION_FIELDS)
+COMMIT_KEYS = tuple(key for key, _ in COMMIT_FIELDS)
+COMMIT_COLUMNS = tuple(column.label(key) for key, column in COMMIT_FIELDS)
+
+
+def format_session_dict(row) -> Dict[str, Any]:
+    """Convert a row starting with SESSION_COLUMNS to a dictionary for MCP responses."""
+    return dict(zip(SESSION_KEYS, row))
+
+
+def format_commit_dict(row) -> Dict[str, Any]:
+    """Convert a row starting with COMMIT_COLUMNS to a dictionary for MCP responses."""
+    return dict(zip(COMMIT_KEYS, row))
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_sessions(
     limit: int = 10,
     tool: Optional[str] = None,
@@ -91,15 +204,13 @@ def get_sessions(
         JSON string with list of sessions
     """
     db = get_db()
-    query = db.query(AIInteraction).options(
-        defer(AIInteraction.session_transcript)  # Don't load transcript (can be huge)
-    ).filter(AIInteraction.is_session == 1)
+    query = db.query(*SESSION_COLUMNS).filter(AIInteraction.is_session == 1)
 
     if tool:
         query = query.filter(AIInteraction.ai_tool == tool)
 
     if repo_path:
-        query = query.filter(AIInteraction.repo_path.like(f"%{repo_path}%"))
+        query = query.filter(_repo_filter(AIInteraction.repo_path, repo_path))
 
     if days:
         cutoff = datetime.now() - timedelta(days=days)
@@ -113,10 +224,12 @@ def get_sessions(
         "sessions": [format_session_dict(s) for s in sessions]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_session_summary(session_id: int) -> str:
     """Get detailed summary of a specific Chronicle session.
 
@@ -127,41 +240,47 @@ def get_session_summary(session_id: int) -> str:
         JSON string with session details and full summary
     """
     db = get_db()
-    session = db.query(AIInteraction).options(
-        defer(AIInteraction.session_transcript)  # Don't load transcript (can be huge)
-    ).filter(AIInteraction.id == session_id).first()
+    # One row per chunk (or a single row without chunk columns), in one query
+    rows = db.query(
+        *SESSION_COLUMNS,
+        AIInteraction.session_transcript,
+        SessionSummaryChunk.chunk_number,
+        SessionSummaryChunk.chunk_start_line,
+        SessionSummaryChunk.chunk_end_line,
+        SessionSummaryChunk.chunk_summary,
+    ).outerjoin(AIInteraction.summary_chunks).filter(
+        AIInteraction.id == session_id
+    ).order_by(SessionSummaryChunk.chunk_number).all()
 
-    if not session:
-        return json.dumps({"error": f"Session {session_id} not found"})
+    if not rows:
+        return _dump({"error": f"Session {session_id} not found"})
 
+    session = rows[0]
     result = format_session_dict(session)
 
     # Add transcript path if available
     if session.session_transcript:
-        home = os.path.expanduser("~")
-        transcript_path = os.path.join(home, ".ai-session", "sessions", session.session_transcript)
+        transcript_path = os.path.join(SESSIONS_DIR, session.session_transcript)
         result["transcript_path"] = transcript_path
         result["transcript_exists"] = os.path.exists(transcript_path)
 
     # Add chunked summaries if available
-    chunks = db.query(SessionSummaryChunk).filter(
-        SessionSummaryChunk.session_id == session_id
-    ).order_by(SessionSummaryChunk.chunk_number).all()
-
-    if chunks:
+    if session.chunk_number is not None:
         result["chunked_summaries"] = [
             {
                 "chunk_number": c.chunk_number,
                 "lines": f"{c.chunk_start_line}-{c.chunk_end_line}",
                 "summary": c.chunk_summary,
             }
-            for c in chunks
+            for c in rows
         ]
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def search_sessions(
     query: str,
     limit: int = 10,
@@ -181,22 +300,24 @@ def search_sessions(
     """
     db = get_db()
 
-    filters = []
+    columns = []
     if search_summaries:
-        filters.append(AIInteraction.response_summary.like(f"%{query}%"))
+        columns.append("response_summary")
     if search_prompts:
-        filters.append(AIInteraction.prompt.like(f"%{query}%"))
+        columns.append("prompt")
+
+    if not columns:
+        return _dump({"error": "Must search summaries or prompts"})
+    if not query.strip():
+        return _dump({"error": "Search query must not be empty"})
 
-    if not filters:
-        return json.dumps({"error": "Must search summaries or prompts"})
+    matches = search_index_matches("ai_fts", query, columns)
 
     limit = min(limit, 50)
-    sessions = db.query(AIInteraction).options(
-        defer(AIInteraction.session_transcript)  # Don't load transcript
-    ).filter(
+    sessions = db.query(*SESSION_COLUMNS).filter(
         and_(
             AIInteraction.is_session == 1,
-            or_(*filters)
+            AIInteraction.id.in_(matches)
         )
     ).order_by(desc(AIInteraction.timestamp)).limit(limit).all()
 
@@ -206,10 +327,12 @@ def search_sessions(
         "sessions": [format_session_dict(s) for s in sessions]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_commits(
     limit: int = 20,
     repo_path: Optional[str] = None,
@@ -228,10 +351,10 @@ def get_commits(
         JSON string with list of commits
     """
     db = get_db()
-    query = db.query(Commit)
+    query = db.query(*COMMIT_COLUMNS)
 
     if repo_path:
-        query = query.filter(Commit.repo_path.like(f"%{repo_path}%"))
+        query = query.filter(_repo_filter(Commit.repo_path, repo_path))
 
     if author:
         query = query.filter(Commit.author.like(f"%{author}%"))
@@ -248,77 +371,122 @@ def get_commits(
         "commits": [format_commit_dict(c) for c in commits]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_timeline(
     days: int = 1,
     repo_path: Optional[str] = None,
 ) -> str:
     """Get combined timeline of commits and sessions.
 
+    At most days * 500 of the newest items are returned. When more match,
+    "truncated" is true; the counts always cover every matching item.
+
     Args:
-        days: Number of days to show (default: 1 = today)
+        days: Number of days to show, at least 1 (default: 1 = today)
         repo_path: Filter by repository path
 
     Returns:
         JSON string with timeline of commits and sessions
     """
+    if days < 1:
+        return _dump({"error": "days must be at least 1"})
+
     db = get_db()
     cutoff = datetime.now() - timedelta(days=days)
 
-    # Get commits
-    commit_query = db.query(Commit).filter(Commit.timestamp >= cutoff)
-    if repo_path:
-        commit_query = commit_query.filter(Commit.repo_path.like(f"%{repo_path}%"))
-    commits = commit_query.order_by(desc(Commit.timestamp)).all()
-
-    # Get sessions
-    session_query = db.query(AIInteraction).options(
-        defer(AIInteraction.session_transcript)  # Don't load transcript
-    ).filter(
-        and_(
-            AIInteraction.is_session == 1,
-            AIInteraction.timestamp >= cutoff
-        )
+    # Merge and order both tables in SQL, fetching only (type, id, timestamp)
+    session_ids = select(
+        literal("session").label("type"),
+        AIInteraction.id.label("id"),
+        AIInteraction.timestamp.label("timestamp"),
+    ).where(
+        AIInteraction.is_session == 1,
+        AIInteraction.timestamp >= cutoff
     )
+    commit_ids = select(
+        literal("commit"),
+        Commit.id,
+        Commit.timestamp,
+    ).where(Commit.timestamp >= cutoff)
     if repo_path:
-        session_query = session_query.filter(AIInteraction.repo_path.like(f"%{repo_path}%"))
-    sessions = session_query.order_by(desc(AIInteraction.timestamp)).all()
-
-    # Combine and sort by timestamp
+        session_ids = session_ids.where(_repo_filter(AIInteraction.repo_path, repo_path))
+        commit_ids = commit_ids.where(_repo_filter(Commit.repo_path, repo_path))
+
+    # One extra row tells whether anything was cut off
+    limit = days * TIMELINE_ITEMS_PER_DAY
+    rows = db.execute(
+        union_all(session_ids, commit_ids)
+        .order_by(desc("timestamp"))
+        .limit(limit + 1)
+    ).yield_per(TIMELINE_BATCH_SIZE)
+
+    # Hydrate the ordered ids a batch at a time, one IN query per table per batch
     timeline = []
+    counts = {"session": 0, "commit": 0}
+    truncated = False
+    for batch in rows.partitions():
+        room = limit - sum(counts.values())
+        if len(batch) > room:
+            batch, truncated = batch[:room], True
+
+        wanted = {"session": [], "commit": []}
+        for row in batch:
+            wanted[row.type].append(row.id)
+            counts[row.type] += 1
+
+        sessions = {}
+        if wanted["session"]:
+            sessions = {
+                s.id: s for s in db.query(*SESSION_COLUMNS).filter(AIInteraction.id.in_(wanted["session"]))
+            }
+        commits = {}
+        if wanted["commit"]:
+            commits = {
+                c.id: c for c in db.query(*COMMIT_COLUMNS).filter(Commit.id.in_(wanted["commit"]))
+            }
 
-    for commit in commits:
-        timeline.append({
-            "type": "commit",
-            "timestamp": commit.timestamp.isoformat(),
-            "data": format_commit_dict(commit)
-        })
-
-    for session in sessions:
-        timeline.append({
-            "type": "session",
-            "timestamp": session.timestamp.isoformat(),
-            "data": format_session_dict(session)
-        })
-
-    timeline.sort(key=lambda x: x["timestamp"], reverse=True)
+        for row in batch:
+            if row.type == "session":
+                data = format_session_dict(sessions[row.id])
+            else:
+                data = format_commit_dict(commits[row.id])
+            timeline.append({
+                "type": row.type,
+                "timestamp": row.timestamp,
+                "data": data
+            })
+
+        if truncated:
+            break
+
+    if truncated:
+        # Count everything in range, not just the returned slice
+        matching = union_all(session_ids, commit_ids).subquery()
+        counts.update(db.execute(
+            select(matching.c.type, func.count()).group_by(matching.c.type)
+        ).all())
 
     result = {
         "days": days,
         "repo_path": repo_path,
-        "total_items": len(timeline),
-        "commits_count": len(commits),
-        "sessions_count": len(sessions),
+        "total_items": sum(counts.values()),
+        "commits_count": counts["commit"],
+        "sessions_count": counts["session"],
+        "truncated": truncated,
         "timeline": timeline
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_stats(days: int = 7) -> str:
     """Get Chronicle usage statistics.
 
@@ -331,52 +499,57 @@ def get_stats(days: int = 7) -> str:
     db = get_db()
     cutoff = datetime.now() - timedelta(days=days)
 
-    # Session stats
-    sessions = db.query(AIInteraction).options(
-        defer(AIInteraction.session_transcript)  # Don't load transcript
-    ).filter(
-        and_(
-            AIInteraction.is_session == 1,
-            AIInteraction.timestamp >= cutoff
-        )
-    ).all()
-
-    # Commit stats
-    commits = db.query(Commit).filter(Commit.timestamp >= cutoff).all()
-
-    # Calculate stats
-    total_sessions = len(sessions)
-    total_duration_minutes = sum(
-        (s.duration_ms or 0) / 60000 for s in sessions
+    session_filter = and_(
+        AIInteraction.is_session == 1,
+        AIInteraction.timestamp >= cutoff
     )
 
-    sessions_by_tool = {}
-    for session in sessions:
-        tool = session.ai_tool
-        sessions_by_tool[tool] = sessions_by_tool.get(tool, 0) + 1
+    # Session stats, grouped by tool
+    tool_rows = db.query(
+        AIInteraction.ai_tool,
+        func.count(AIInteraction.id),
+        func.coalesce(func.sum(AIInteraction.duration_ms), 0),
+    ).filter(session_filter).group_by(AIInteraction.ai_tool).all()
 
-    repos = set()
-    for session in sessions:
-        if session.repo_path:
-            repos.add(session.repo_path)
-    for commit in commits:
-        if commit.repo_path:
-            repos.add(commit.repo_path)
+    sessions_by_tool = {tool: count for tool, count, _ in tool_rows}
+    total_sessions = sum(sessions_by_tool.values())
+    total_duration_minutes = sum(duration for _, _, duration in tool_rows) / 60000
+
+    # Commit stats
+    total_commits = db.query(func.count(Commit.id)).filter(
+        Commit.timestamp >= cutoff
+    ).scalar()
+
+    # Distinct repositories across sessions and commits (UNION deduplicates)
+    repos = [
+        row[0] for row in db.execute(
+            union(
+                select(AIInteraction.repo_path).where(
+                    session_filter, AIInteraction.repo_path.isnot(None)
+                ),
+                select(Commit.repo_path).where(
+                    Commit.timestamp >= cutoff, Commit.repo_path.isnot(None)
+                ),
+            )
+        )
+    ]
 
     result = {
         "period_days": days,
         "total_sessions": total_sessions,
-        "total_commits": len(commits),
+        "total_commits": total_commits,
         "total_duration_minutes": round(total_duration_minutes, 1),
         "sessions_by_tool": sessions_by_tool,
         "unique_repositories": len(repos),
-        "repositories": list(repos),
+        "repositories": repos,
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def search_commits(query: str, limit: int = 20) -> str:
     """Search git commits by commit message.
 
@@ -389,9 +562,14 @@ def search_commits(query: str, limit: int = 20) -> str:
     """
     db = get_db()
 
+    if not query.strip():
+        return _dump({"error": "Search query must not be empty"})
+
+    matches = search_index_matches("commit_fts", query)
+
     limit = min(limit, 100)
-    commits = db.query(Commit).filter(
-        Commit.message.like(f"%{query}%")
+    commits = db.query(*COMMIT_COLUMNS).filter(
+        Commit.id.in_(matches)
     ).order_by(desc(Commit.timestamp)).limit(limit).all()
 
     result = {
@@ -400,47 +578,58 @@ def search_commits(query: str, limit: int = 20) -> str:
         "commits": [format_commit_dict(c) for c in commits]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 # ============================================================================
 # PROJECT TRACKING MCP TOOLS (Milestones & Next Steps)
 # ============================================================================
 
-def format_milestone_dict(milestone: ProjectMilestone) -> Dict[str, Any]:
-    """Convert ProjectMilestone to a clean dictionary for MCP responses."""
-    return {
-        "id": milestone.id,
-        "title": milestone.title,
-        "description": milestone.description,
-        "status": milestone.status,
-        "type": milestone.milestone_type,
-        "priority": milestone.priority,
-        "created_at": milestone.created_at.isoformat(),
-        "completed_at": milestone.completed_at.isoformat() if milestone.completed_at else None,
-        "tags": milestone.tags_list,
-        "related_sessions": milestone.sessions_list,
-        "related_commits": milestone.commits_list,
-    }
+MILESTONE_FIELDS = (
+    ("id", ProjectMilestone.id),
+    ("title", ProjectMilestone.title),
+    ("description", ProjectMilestone.description),
+    ("status", ProjectMilestone.status),
+    ("type", ProjectMilestone.milestone_type),
+    ("priority", ProjectMilestone.priority),
+    ("created_at", ProjectMilestone.created_at),
+    ("completed_at", ProjectMilestone.completed_at),
+    ("tags", ProjectMilestone.tags),
+    ("related_sessions", ProjectMilestone.related_sessions),
+    ("related_commits", ProjectMilestone.related_commits),
+)
+NEXT_STEP_FIELDS = (
+    ("id", NextStep.id),
+    ("description", NextStep.description),
+    ("priority", NextStep.priority),
+    ("estimated_effort", NextStep.estimated_effort),
+    ("category", NextStep.category),
+    ("created_by", NextStep.created_by),
+    ("completed", type_coerce(NextStep.completed, Boolean)),
+    ("created_at", NextStep.created_at),
+    ("completed_at", NextStep.completed_at),
+    ("related_milestone_id", NextStep.related_milestone_id),
+)
 
+MILESTONE_KEYS = tuple(key for key, _ in MILESTONE_FIELDS)
+MILESTONE_COLUMNS = tuple(column.label(key) for key, column in MILESTONE_FIELDS)
+NEXT_STEP_KEYS = tuple(key for key, _ in NEXT_STEP_FIELDS)
+NEXT_STEP_COLUMNS = tuple(column.label(key) for key, column in NEXT_STEP_FIELDS)
 
-def format_next_step_dict(step: NextStep) -> Dict[str, Any]:
-    """Convert NextStep to a clean dictionary for MCP responses."""
-    return {
-        "id": step.id,
-        "description": step.description,
-        "priority": step.priority,
-        "estimated_effort": step.estimated_effort,
-        "category": step.category,
-        "created_by": step.created_by,
-        "completed": bool(step.completed),
-        "created_at": step.created_at.isoformat(),
-        "completed_at": step.completed_at.isoformat() if step.completed_at else None,
-        "related_milestone_id": step.related_milestone_id,
-    }
+
+def format_milestone_dict(row) -> Dict[str, Any]:
+    """Convert a row starting with MILESTONE_COLUMNS to a dictionary for MCP responses."""
+    return dict(zip(MILESTONE_KEYS, row))
+
+
+def format_next_step_dict(row) -> Dict[str, Any]:
+    """Convert a row starting with NEXT_STEP_COLUMNS to a dictionary for MCP responses."""
+    return dict(zip(NEXT_STEP_KEYS, row))
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_milestones(
     status: Optional[str] = None,
     milestone_type: Optional[str] = None,
@@ -457,7 +646,7 @@ def get_milestones(
         JSON string with list of milestones
     """
     db = get_db()
-    query = db.query(ProjectMilestone)
+    query = db.query(*MILESTONE_COLUMNS)
 
     if status:
         query = query.filter(ProjectMilestone.status == status)
@@ -477,10 +666,12 @@ def get_milestones(
         "milestones": [format_milestone_dict(m) for m in milestones]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_milestone(milestone_id: int) -> str:
     """Get detailed information about a specific milestone.
 
@@ -491,37 +682,37 @@ def get_milestone(milestone_id: int) -> str:
         JSON string with milestone details including linked sessions and commits
     """
     db = get_db()
-    milestone = db.query(ProjectMilestone).filter_by(id=milestone_id).first()
+    milestone = db.query(*MILESTONE_COLUMNS).filter(ProjectMilestone.id == milestone_id).first()
 
     if not milestone:
-        return json.dumps({"error": f"Milestone #{milestone_id} not found"}, indent=2)
+        return _dump({"error": f"Milestone #{milestone_id} not found"})
 
     # Get linked sessions
     linked_sessions = []
-    if milestone.sessions_list:
-        sessions = db.query(AIInteraction).options(
-            defer(AIInteraction.session_transcript)  # Don't load transcript
-        ).filter(
-            AIInteraction.id.in_(milestone.sessions_list)
-        ).all()
+    if milestone.related_sessions:
+        sessions = db.query(*SESSION_COLUMNS).filter(
+            AIInteraction.id.in_(milestone.related_sessions)
+        ).order_by(desc(AIInteraction.timestamp)).all()
         linked_sessions = [format_session_dict(s) for s in sessions]
 
     # Get linked commits
     linked_commits = []
-    if milestone.commits_list:
-        commits = db.query(Commit).filter(
-            Commit.sha.in_(milestone.commits_list)
-        ).all()
+    if milestone.related_commits:
+        commits = db.query(*COMMIT_COLUMNS).filter(
+            Commit.sha.in_(milestone.related_commits)
+        ).order_by(desc(Commit.timestamp)).all()
         linked_commits = [format_commit_dict(c) for c in commits]
 
     result = format_milestone_dict(milestone)
     result["linked_sessions"] = linked_sessions
     result["linked_commits"] = linked_commits
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_next_steps(
     completed: Optional[bool] = None,
     milestone_id: Optional[int] = None,
@@ -538,7 +729,7 @@ def get_next_steps(
         JSON string with list of next steps
     """
     db = get_db()
-    query = db.query(NextStep)
+    query = db.query(*NEXT_STEP_COLUMNS)
 
     if completed is not None:
         query = query.filter(NextStep.completed == (1 if completed else 0))
@@ -558,10 +749,12 @@ def get_next_steps(
         "next_steps": [format_next_step_dict(s) for s in steps]
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@ttl_cache()
+@releases_db
 def get_roadmap(days: int = 7) -> str:
     """Get project roadmap showing current progress and planned work.
 
@@ -573,31 +766,50 @@ def get_roadmap(days: int = 7) -> str:
     """
     db = get_db()
 
-    # In progress milestones
-    in_progress = db.query(ProjectMilestone).filter_by(status='in_progress').all()
-
-    # Recent completions
     cutoff = datetime.now() - timedelta(days=days)
-    completed = db.query(ProjectMilestone).filter(
-        ProjectMilestone.status == 'completed',
-        ProjectMilestone.completed_at >= cutoff
-    ).order_by(ProjectMilestone.completed_at.desc()).limit(10).all()
-
-    # Planned (high priority)
-    planned = db.query(ProjectMilestone).filter_by(status='planned').order_by(
-        ProjectMilestone.priority
-    ).limit(10).all()
+
+    # All three milestone lists in one query: rank each status group in its
+    # display order (completed by completed_at, others by priority), then keep
+    # every in-progress milestone and the top 10 of the other two groups
+    ranked = select(
+        *MILESTONE_COLUMNS,
+        func.row_number().over(
+            partition_by=ProjectMilestone.status,
+            order_by=(
+                case((ProjectMilestone.status == 'completed', ProjectMilestone.completed_at)).desc(),
+                ProjectMilestone.priority,
+                ProjectMilestone.id,
+            ),
+        ).label("rank"),
+    ).where(
+        or_(
+            ProjectMilestone.status.in_(['in_progress', 'planned']),
+            and_(
+                ProjectMilestone.status == 'completed',
+                ProjectMilestone.completed_at >= cutoff
+            )
+        )
+    ).subquery()
+    milestones = db.query(*(ranked.c[key] for key in MILESTONE_KEYS)).filter(
+        or_(ranked.c.status == 'in_progress', ranked.c.rank <= 10)
+    ).order_by(ranked.c.rank).all()
+
+    by_status = {'in_progress': [], 'completed': [], 'planned': []}
+    for m in milestones:
+        by_status[m.status].append(m)
 
     # Pending next steps
-    pending_steps = db.query(NextStep).filter_by(completed=0).order_by(
+    pending_steps = db.query(*NEXT_STEP_COLUMNS).filter(NextStep.completed == 0).order_by(
         NextStep.priority
     ).limit(10).all()
 
-    # Stats
-    total_milestones = db.query(ProjectMilestone).count()
-    total_completed = db.query(ProjectMilestone).filter_by(status='completed').count()
-    total_steps = db.query(NextStep).count()
-    completed_steps = db.query(NextStep).filter_by(completed=1).count()
+    # Stats, as one row of scalar subqueries
+    total_milestones, total_completed, total_steps, completed_steps = db.execute(select(
+        select(func.count(ProjectMilestone.id)).scalar_subquery(),
+        select(func.count(ProjectMilestone.id)).where(ProjectMilestone.status == 'completed').scalar_subquery(),
+        select(func.count(NextStep.id)).scalar_subquery(),
+        select(func.count(NextStep.id)).where(NextStep.completed == 1).scalar_subquery(),
+    )).one()
 
     result = {
         "summary": {
@@ -606,16 +818,17 @@ def get_roadmap(days: int = 7) -> str:
             "total_next_steps": total_steps,
             "completed_next_steps": completed_steps,
         },
-        "in_progress": [format_milestone_dict(m) for m in in_progress],
-        "recently_completed": [format_milestone_dict(m) for m in completed],
-        "planned_high_priority": [format_milestone_dict(m) for m in planned],
+        "in_progress": [format_milestone_dict(m) for m in by_status['in_progress']],
+        "recently_completed": [format_milestone_dict(m) for m in by_status['completed']],
+        "planned_high_priority": [format_milestone_dict(m) for m in by_status['planned']],
         "pending_next_steps": [format_next_step_dict(s) for s in pending_steps],
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@releases_db
 def update_milestone_status(milestone_id: int, new_status: str) -> str:
     """Update the status of a milestone.
 
@@ -630,13 +843,13 @@ def update_milestone_status(milestone_id: int, new_status: str) -> str:
     milestone = db.query(ProjectMilestone).filter_by(id=milestone_id).first()
 
     if not milestone:
-        return json.dumps({"error": f"Milestone #{milestone_id} not found"}, indent=2)
+        return _dump({"error": f"Milestone #{milestone_id} not found"})
 
     valid_statuses = ['planned', 'in_progress', 'completed', 'archived']
     if new_status not in valid_statuses:
-        return json.dumps({
+        return _dump({
             "error": f"Invalid status '{new_status}'. Must be one of: {', '.join(valid_statuses)}"
-        }, indent=2)
+        })
 
     old_status = milestone.status
     milestone.status = new_status
@@ -645,6 +858,7 @@ def update_milestone_status(milestone_id: int, new_status: str) -> str:
         milestone.completed_at = datetime.now()
 
     db.commit()
+    clear_response_cache()  # Milestone tools may hold the old status
 
     result = {
         "success": True,
@@ -654,10 +868,11 @@ def update_milestone_status(milestone_id: int, new_status: str) -> str:
         "new_status": new_status,
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 @mcp.tool()
+@releases_db
 def complete_next_step(step_id: int) -> str:
     """Mark a next step as completed.
 
@@ -671,20 +886,21 @@ def complete_next_step(step_id: int) -> str:
     step = db.query(NextStep).filter_by(id=step_id).first()
 
     if not step:
-        return json.dumps({"error": f"Next step #{step_id} not found"}, indent=2)
+        return _dump({"error": f"Next step #{step_id} not found"})
 
     step.completed = 1
     step.completed_at = datetime.now()
     db.commit()
+    clear_response_cache()  # Roadmap and next-step lists may hold the old state
 
     result = {
         "success": True,
         "step_id": step_id,
         "description": step.description,
-        "completed_at": step.completed_at.isoformat(),
+        "completed_at": step.completed_at,
     }
 
-    return json.dumps(result, indent=2)
+    return _dump(result)
 
 
 if __name__ == "__main__":
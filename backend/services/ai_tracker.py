@@ -1,11 +1,14 @@
 """AI interaction tracking service."""
 
 import os
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from typing import List, Optional
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from backend.database.models import AIInteraction, Commit
+from backend.database.models import AIInteraction, Commit, search_index_matches
+from backend.utils.git_root import find_git_root
 
 
 class AITracker:
@@ -71,10 +74,8 @@ class AITracker:
         if files_mentioned:
             interaction.files_list = files_mentioned
 
+        # Link to a recent commit (if any) and save in a single commit
         self.db.add(interaction)
-        self.db.commit()
-
-        # Try to link to recent commit
         self._link_to_commit(interaction)
 
         return interaction
@@ -86,21 +87,44 @@ class AITracker:
             interaction: AIInteraction to link
             window_minutes: Time window to search for commits (default: 30 minutes)
         """
-        # Look for commits within the time window after the interaction
-        start_time = interaction.timestamp
-        end_time = start_time + timedelta(minutes=window_minutes)
-
-        recent_commit = (
-            self.db.query(Commit)
-            .filter(Commit.timestamp >= start_time)
-            .filter(Commit.timestamp <= end_time)
-            .order_by(Commit.timestamp.asc())
-            .first()
+        self.link_interactions_batch([interaction], window_minutes)
+
+    def link_interactions_batch(self, interactions: List[AIInteraction], window_minutes: int = 30) -> int:
+        """Link each interaction to the first commit within a window after it.
+
+        Candidate commits for the whole batch are loaded with one query and
+        matched by binary search, so backfills cost two round trips (the
+        lookup and the final commit) regardless of batch size.
+
+        Args:
+            interactions: AIInteractions to link
+            window_minutes: Time window to search for commits (default: 30 minutes)
+
+        Returns:
+            Number of interactions that were linked to a commit
+        """
+        if not interactions:
+            return 0
+
+        window = timedelta(minutes=window_minutes)
+        commits = (
+            self.db.query(Commit.id, Commit.timestamp)
+            .filter(Commit.timestamp >= min(i.timestamp for i in interactions))
+            .filter(Commit.timestamp <= max(i.timestamp for i in interactions) + window)
+            .order_by(Commit.timestamp.asc(), Commit.id.asc())
+            .all()
         )
+        timestamps = [c.timestamp for c in commits]
+
+        linked = 0
+        for interaction in interactions:
+            index = bisect_left(timestamps, interaction.timestamp)
+            if index < len(commits) and timestamps[index] <= interaction.timestamp + window:
+                interaction.related_commit_id = commits[index].id
+                linked += 1
 
-        if recent_commit:
-            interaction.related_commit_id = recent_commit.id
-            self.db.commit()
+        self.db.commit()
+        return linked
 
     def get_interactions_today(self, ai_tool: str = None, repo_path: str = None) -> List[AIInteraction]:
         """Get all AI interactions from today.
@@ -157,15 +181,21 @@ class AITracker:
     def search_interactions(self, search_term: str) -> List[AIInteraction]:
         """Search AI interactions by prompt content.
 
+        Uses the prompt full-text index, so words (and word prefixes) match
+        rather than arbitrary substrings.
+
         Args:
             search_term: Term to search for in prompts
 
         Returns:
             List of matching AIInteraction objects
         """
+        if not search_term.strip():
+            return []
+
         return (
             self.db.query(AIInteraction)
-            .filter(AIInteraction.prompt.contains(search_term))
+            .filter(AIInteraction.id.in_(search_index_matches("ai_fts", search_term, ["prompt"])))
             .order_by(AIInteraction.timestamp.desc())
             .all()
         )
@@ -180,20 +210,21 @@ class AITracker:
             Dictionary with usage stats per AI tool
         """
         start_date = datetime.now() - timedelta(days=days)
-        interactions = self.get_interactions_by_date(start_date)
-
-        # Count by tool
-        stats = {}
-        for interaction in interactions:
-            tool = interaction.ai_tool
-            if tool not in stats:
-                stats[tool] = {"count": 0, "total_duration_ms": 0}
-
-            stats[tool]["count"] += 1
-            if interaction.duration_ms:
-                stats[tool]["total_duration_ms"] += interaction.duration_ms
+        rows = (
+            self.db.query(
+                AIInteraction.ai_tool,
+                func.count(AIInteraction.id),
+                func.coalesce(func.sum(AIInteraction.duration_ms), 0),
+            )
+            .filter(AIInteraction.timestamp >= start_date)
+            .group_by(AIInteraction.ai_tool)
+            .all()
+        )
 
-        return stats
+        return {
+            tool: {"count": count, "total_duration_ms": total_duration_ms}
+            for tool, count, total_duration_ms in rows
+        }
 
     def get_interaction_with_commit(self, interaction_id: int) -> tuple:
         """Get an AI interaction and its related commit if any.
@@ -224,15 +255,4 @@ class AITracker:
         Returns:
             Git repository root path or None if not in a git repo
         """
-        from pathlib import Path
-
-        current = Path(start_path).resolve()
-
-        # Walk up directory tree looking for .git
-        while current != current.parent:
-            git_dir = current / ".git"
-            if git_dir.exists():
-                return str(current)
-            current = current.parent
-
-        return None
+        return find_git_root(start_path)
@@ -1,12 +1,19 @@
 """Git commit monitoring and tracking service."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from git import Repo, GitCommandError, InvalidGitRepositoryError
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from backend.database.models import Commit
+from backend.database.models import Commit, search_index_matches
+
+# Upper bound on repositories read concurrently by scan_repos()
+SCAN_WORKERS = 8
 
 
 class GitMonitor:
@@ -30,6 +37,50 @@ class GitMonitor:
         Returns:
             List of Commit objects that were added to database
 
+        Raises:
+            ValueError: If path is not a valid git repository
+        """
+        return self._store_commits(self._read_commits(repo_path, limit))
+
+    def scan_repos(self, repo_paths: List[str], limit: int = 50) -> List[Commit]:
+        """Scan several git repositories concurrently and store recent commits.
+
+        Reading git history is independent per repository (and mostly spent
+        waiting on git subprocesses), so repositories are read on a thread
+        pool. The database is only touched afterwards, from this thread, with
+        a single insert for every repository.
+
+        Args:
+            repo_paths: Paths to git repositories
+            limit: Maximum number of recent commits to scan per repository
+
+        Returns:
+            List of Commit objects that were added to database
+
+        Raises:
+            ValueError: If any path is not a valid git repository
+        """
+        if not repo_paths:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(repo_paths))) as executor:
+            batches = list(executor.map(lambda path: self._read_commits(path, limit), repo_paths))
+
+        return self._store_commits([row for rows in batches for row in rows])
+
+    def _read_commits(self, repo_path: str, limit: int) -> List[Dict]:
+        """Read recent commits from a repository as Commit column values.
+
+        Only talks to git, never the database, so it is safe to run from
+        worker threads.
+
+        Args:
+            repo_path: Path to git repository
+            limit: Maximum number of recent commits to read
+
+        Returns:
+            List of dicts of Commit column values, newest first
+
         Raises:
             ValueError: If path is not a valid git repository
         """
@@ -41,46 +92,126 @@ class GitMonitor:
         except (GitCommandError, InvalidGitRepositoryError):
             raise ValueError(f"Not a valid git repository: {repo_path}")
 
-        # Get recent commits
-        commits_added = []
-        for git_commit in list(repo.iter_commits(max_count=limit)):
-            # Check if commit already exists
-            existing = self.db.query(Commit).filter_by(
-                sha=git_commit.hexsha,
-                repo_path=repo_path
-            ).first()
-
-            if existing:
-                continue
+        abs_repo_path = os.path.abspath(repo_path)
+        git_commits = self._log_commits(repo, limit)
+        if not git_commits:
+            return []
+
+        # active_branch raises on a detached HEAD (e.g. mid-rebase or a checked-out tag)
+        branch = "unknown" if repo.head.is_detached else repo.active_branch.name
+
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(committed_date),
+                "sha": sha,
+                "message": message,
+                "files_changed": files_changed,
+                "branch": branch,
+                "author": author,
+                "repo_path": abs_repo_path,
+            }
+            for sha, committed_date, author, message, files_changed in git_commits
+        ]
 
-            # Get list of files changed
-            files_changed = []
-            try:
-                if git_commit.parents:
-                    diff = git_commit.parents[0].diff(git_commit)
-                    files_changed = [item.a_path or item.b_path for item in diff]
-            except Exception:
-                # If we can't get diff (e.g., initial commit), skip it
-                pass
-
-            # Create commit record
-            commit = Commit(
-                timestamp=datetime.fromtimestamp(git_commit.committed_date),
-                sha=git_commit.hexsha,
-                message=git_commit.message.strip(),
-                files_changed=None,
-                branch=repo.active_branch.name if repo.active_branch else "unknown",
-                author=str(git_commit.author),
-                repo_path=os.path.abspath(repo_path)
-            )
-            commit.files_list = files_changed
+    def _store_commits(self, rows: List[Dict]) -> List[Commit]:
+        """Insert commit rows, skipping ones already stored.
+
+        Existing commits are skipped by the (sha, repo_path) unique index
+        rather than a lookup per commit. Databases whose duplicate commits
+        have not been cleaned up by the migrate command lack that index and
+        fall back to a single batched lookup.
 
-            self.db.add(commit)
-            commits_added.append(commit)
+        Args:
+            rows: Commit column values from _read_commits()
+
+        Returns:
+            List of Commit objects that were added, in the order given
+        """
+        if not rows:
+            return []
+
+        # One batched INSERT OR IGNORE; RETURNING yields only the new rows
+        stmt = insert(Commit).on_conflict_do_nothing(
+            index_elements=["sha", "repo_path"]
+        ).returning(Commit, sort_by_parameter_order=True)
+        try:
+            commits_added = self.db.scalars(stmt, rows).all()
+        except OperationalError:
+            # ON CONFLICT needs the unique index (migration v9)
+            self.db.rollback()
+            return self._store_new_commits(rows)
+        self.db.commit()
+        return commits_added
+
+    def _store_new_commits(self, rows: List[Dict]) -> List[Commit]:
+        """Insert commit rows not already stored, without the unique index.
+
+        Args:
+            rows: Commit column values from _read_commits()
+
+        Returns:
+            List of Commit objects that were added, in the order given
+        """
+        seen = set(
+            self.db.query(Commit.sha, Commit.repo_path)
+            .filter(Commit.sha.in_({row["sha"] for row in rows}))
+            .all()
+        )
+        commits_added = []
+        for row in rows:
+            key = (row["sha"], row["repo_path"])
+            if key not in seen:
+                seen.add(key)
+                commits_added.append(Commit(**row))
 
+        self.db.add_all(commits_added)
         self.db.commit()
         return commits_added
 
+    def _log_commits(self, repo: Repo, limit: int) -> List[Tuple[str, int, str, str, List[str]]]:
+        """Read the last ``limit`` commits and the files each one changed.
+
+        Uses a single ``git log --name-only`` call rather than loading each
+        commit object and diffing it (one git round trip per commit).
+
+        Args:
+            repo: Repository being scanned
+            limit: Maximum number of commits to read
+
+        Returns:
+            List of (sha, committed timestamp, author name, message, changed
+            file paths) tuples, newest first
+        """
+        try:
+            # Records start with RS and fields are separated by US; the files
+            # listed by --name-only follow the last field. -m diffs merges
+            # against every parent, repeating the record; only the first
+            # (first-parent) one is kept.
+            output = repo.git.log(
+                f"--max-count={limit}", "-m", "--name-only",
+                "--format=%x1e%H%x1f%ct%x1f%an%x1f%B%x1f",
+            )
+        except GitCommandError:
+            # e.g. a repository without any commits yet
+            return []
+
+        commits = []
+        seen = set()
+        for record in output.split("\x1e")[1:]:
+            sha, committed_date, author, message, files = record.split("\x1f")
+            if sha in seen:
+                continue
+            seen.add(sha)
+            commits.append((
+                sha,
+                int(committed_date),
+                author,
+                message.strip(),
+                [line for line in files.splitlines() if line],
+            ))
+
+        return commits
+
     def get_latest_commit(self, repo_path: str) -> Optional[Commit]:
         """Get the most recent commit for a repository.
 
@@ -90,9 +221,10 @@ class GitMonitor:
         Returns:
             Most recent Commit object or None
         """
+        # scan_repo stores newest first, so the lower id wins same-second ties
         return self.db.query(Commit).filter_by(
             repo_path=os.path.abspath(repo_path)
-        ).order_by(Commit.timestamp.desc()).first()
+        ).order_by(Commit.timestamp.desc(), Commit.id).first()
 
     def get_commits_by_date(
         self,
@@ -135,14 +267,20 @@ class GitMonitor:
     def search_commits(self, search_term: str) -> List[Commit]:
         """Search commits by message content.
 
+        Uses the commit message full-text index, so words (and word prefixes)
+        match rather than arbitrary substrings.
+
         Args:
             search_term: Term to search for in commit messages
 
         Returns:
             List of matching Commit objects
         """
+        if not search_term.strip():
+            return []
+
         return self.db.query(Commit).filter(
-            Commit.message.contains(search_term)
+            Commit.id.in_(search_index_matches("commit_fts", search_term))
         ).order_by(Commit.timestamp.desc()).all()
 
     def get_repo_stats(self, repo_path: str) -> Dict:
@@ -154,23 +292,27 @@ class GitMonitor:
         Returns:
             Dictionary with stats (total_commits, latest_commit, etc.)
         """
-        commits = self.db.query(Commit).filter_by(
-            repo_path=os.path.abspath(repo_path)
-        ).all()
+        abs_repo_path = os.path.abspath(repo_path)
+        total_commits = self.db.query(func.count(Commit.id)).filter(
+            Commit.repo_path == abs_repo_path
+        ).scalar()
 
-        if not commits:
+        if not total_commits:
             return {
                 "total_commits": 0,
                 "latest_commit": None,
                 "authors": []
             }
 
-        authors = list(set(c.author for c in commits))
-        latest = max(commits, key=lambda c: c.timestamp)
+        authors = [
+            author for (author,) in self.db.query(Commit.author).filter(
+                Commit.repo_path == abs_repo_path
+            ).distinct()
+        ]
 
         return {
-            "total_commits": len(commits),
-            "latest_commit": latest,
+            "total_commits": total_commits,
+            "latest_commit": self.get_latest_commit(repo_path),
             "authors": authors,
-            "repo_path": os.path.abspath(repo_path)
+            "repo_path": abs_repo_path
         }
@@ -10,6 +10,7 @@ from typing import Optional, Dict
 from sqlalchemy.orm import Session
 
 from backend.database.models import AIInteraction
+from backend.utils.git_root import find_git_root
 from backend.utils.transcript_cleaner import clean_transcript
 
 
@@ -44,8 +45,9 @@ class SessionManager:
         repo_path = self._find_git_root(cwd)
 
         # Create session record immediately
+        started_at = datetime.now()
         session = AIInteraction(
-            timestamp=datetime.now(),
+            timestamp=started_at,
             ai_tool=f"{tool}-session",
             prompt=f"Interactive {tool} session started",
             response_summary=None,
@@ -69,7 +71,7 @@ class SessionManager:
             "tool": tool,
             "command": tool_command,
             "transcript_file": str(transcript_file),
-            "start_time": datetime.now().isoformat(),
+            "start_time": started_at.isoformat(),
         }
         self._save_metadata(session_id, metadata)
 
@@ -109,8 +111,10 @@ class SessionManager:
         # Load metadata
         metadata = self._load_metadata(session_id)
         start_time = datetime.fromisoformat(metadata["start_time"])
-        end_time = datetime.now()
-        duration_ms = int((end_time - start_time).total_seconds() * 1000)
+        # Wall-clock duration, so time the machine spent asleep still counts
+        # (the monotonic clock stops during sleep); a clock set backwards
+        # mid-session must not produce a negative duration
+        duration_ms = max(0, int((datetime.now() - start_time).total_seconds() * 1000))
 
         # Read transcript
         transcript = self._read_transcript(transcript_file)
@@ -183,20 +187,19 @@ class SessionManager:
 
 
     def _save_metadata(self, session_id: int, metadata: Dict):
-        """Save session metadata to file.
+        """Save session metadata on the session record.
 
         Args:
             session_id: Session ID
             metadata: Metadata dictionary
         """
-        import json
-
-        metadata_file = self.session_dir / f"session_{session_id}.meta"
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        self.db.query(AIInteraction).filter_by(id=session_id).update(
+            {AIInteraction.session_metadata: metadata}
+        )
+        self.db.commit()
 
     def _load_metadata(self, session_id: int) -> Dict:
-        """Load session metadata from file.
+        """Load session metadata from the session record.
 
         Args:
             session_id: Session ID
@@ -204,14 +207,8 @@ class SessionManager:
         Returns:
             Metadata dictionary
         """
-        import json
-
-        metadata_file = self.session_dir / f"session_{session_id}.meta"
-        if not metadata_file.exists():
-            return {}
-
-        with open(metadata_file, "r") as f:
-            return json.load(f)
+        metadata = self.db.query(AIInteraction.session_metadata).filter_by(id=session_id).scalar()
+        return metadata or {}
 
     def get_active_sessions(self) -> list:
         """Get list of active sessions.
@@ -231,16 +228,27 @@ class SessionManager:
     def get_session_transcript(self, session_id: int) -> Optional[str]:
         """Get full transcript for a session.
 
+        Transcripts are kept in the session's .cleaned file rather than the
+        database; only sessions recorded before that still have one inline.
+
         Args:
             session_id: Session ID
 
         Returns:
             Transcript text or None
         """
-        session = self.db.query(AIInteraction).filter_by(id=session_id).first()
-        if session and session.is_session:
+        session = self.db.query(
+            AIInteraction.is_session, AIInteraction.session_transcript
+        ).filter_by(id=session_id).first()
+        if not session or not session.is_session:
+            return None
+        if session.session_transcript is not None:
             return session.session_transcript
-        return None
+
+        cleaned_file = self.session_dir / f"session_{session_id}.cleaned"
+        if not cleaned_file.exists():
+            return None
+        return cleaned_file.read_text(encoding="utf-8")
 
     def needs_summary(self, session_id: int) -> bool:
         """Check if session needs summarization.
@@ -266,13 +274,4 @@ class SessionManager:
         Returns:
             Git repository root path or None if not in a git repo
         """
-        current = Path(start_path).resolve()
-
-        # Walk up directory tree looking for .git
-        while current != current.parent:
-            git_dir = current / ".git"
-            if git_dir.exists():
-                return str(current)
-            current = current.parent
-
-        return None
+        return find_git_root(start_path)
@@ -1,12 +1,164 @@
 """AI summarization service using Gemini or Ollama."""
 
+import contextlib
+import functools
+import hashlib
+import os
+import random
+import re
+import threading
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from enum import Enum
 from datetime import date, datetime
+from pathlib import Path
 from backend.core.config import get_config
 from backend.utils.transcript_cleaner import clean_transcript
 
+# Server-suggested wait in Gemini rate-limit errors ("... retry in 12.5s")
+_RETRY_HINT_PATTERN = re.compile(r'retry in (\d+\.?\d*)s')
+
+# Longest backoff between retries, in seconds (before jitter)
+MAX_RETRY_DELAY = 60
+
+
+def _retry_delay(error_str: str, attempt: int, base: float, hint_buffer: float = 0) -> float:
+    """Compute how long to wait before retrying a failed provider call.
+
+    Uses the delay suggested in the error when there is one; otherwise an
+    exponential backoff with jitter, so concurrent workers that failed
+    together do not all retry at the same moment.
+
+    Args:
+        error_str: Error message from the failed call
+        attempt: Zero-based attempt number that failed
+        base: Backoff for the first retry, in seconds
+        hint_buffer: Seconds added to a server-suggested delay
+
+    Returns:
+        Delay in seconds
+    """
+    match = _RETRY_HINT_PATTERN.search(error_str)
+    if match:
+        return float(match.group(1)) + hint_buffer
+
+    return min(MAX_RETRY_DELAY, base * (2 ** attempt)) * (0.5 + random.random())
+
+
+# Summaries kept in the on-disk cache; least recently used ones are pruned
+SUMMARY_CACHE_MAX_ENTRIES = 1000
+
+# Upper bound on transcripts summarized concurrently by summarize_sessions()
+# (kept low: every worker draws on the same per-minute provider quota)
+SUMMARY_WORKERS = 4
+
+# Cleaned transcripts shorter than this are not sent to the provider
+# (nothing there for a summary to condense)
+MIN_SUMMARY_TRANSCRIPT_CHARS = 200
+
+# Ollama prompts are kept under ~60k characters (~30k tokens, fits Qwen 2.5's
+# 32k context); longer transcripts are condensed part by part first
+OLLAMA_MAX_TRANSCRIPT_CHARS = 60000
+CONDENSE_CHUNK_CHARS = 20000
+CONDENSE_CHUNK_OVERLAP = 500
+# Part summaries are clipped to this length (the prompt asks for 300), so
+# every condensing round shrinks the text whatever the model returns
+CONDENSE_PART_SUMMARY_CHARS = 600
+CONDENSE_MAX_ROUNDS = 3
+
+
+def _chunk_by_chars(text: str, size: int, overlap: int) -> List[str]:
+    """Split text into consecutive slices of ``size`` chars sharing ``overlap`` chars.
+
+    Args:
+        text: Text to split
+        size: Maximum characters per slice
+        overlap: Characters repeated at the start of each following slice
+
+    Returns:
+        List of slices covering the whole text
+    """
+    step = size - overlap
+    return [text[start:start + size] for start in range(0, max(len(text) - overlap, 1), step)]
+
+
+def _gemini_chunk_text(chunk) -> str:
+    """Text of a streamed Gemini response chunk, or "" if it has none.
+
+    Chunk.text raises ValueError for chunks without a text part (e.g. the
+    final chunk carrying only a finish reason or safety ratings).
+
+    Args:
+        chunk: Streamed GenerateContentResponse chunk
+
+    Returns:
+        The chunk's text
+    """
+    try:
+        return chunk.text
+    except ValueError:
+        return ""
+
+
+def _collapse_repeats(items: List[str]) -> List[str]:
+    """Merge repeated activity entries into one entry with a count.
+
+    Entries match when they are equal ignoring case and whitespace; the first
+    occurrence's wording and position are kept.
+
+    Args:
+        items: Commit messages or AI prompts, in order
+
+    Returns:
+        Distinct entries, with " (xN)" appended to ones seen N > 1 times
+    """
+    counts = {}
+    first_seen = {}
+    for item in items:
+        key = " ".join(item.split()).casefold()
+        counts[key] = counts.get(key, 0) + 1
+        first_seen.setdefault(key, item)
+
+    return [
+        item if counts[key] == 1 else f"{item} (x{counts[key]})"
+        for key, item in first_seen.items()
+    ]
+
+
+@functools.lru_cache(maxsize=8)
+def _get_ollama_client(host: str):
+    """Return the shared Ollama client for a host.
+
+    The client keeps a pooled HTTP connection, so summarizers created in the
+    same process reuse it instead of reconnecting for every instance.
+
+    Args:
+        host: Ollama server URL
+
+    Returns:
+        ollama.Client for the host
+    """
+    import ollama
+    return ollama.Client(host=host)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_gemini_model(model_name: str):
+    """Return the shared Gemini model handle for a model name.
+
+    The API key is set process-wide by ``genai.configure``, so handles only
+    depend on the model name and can be reused by every summarizer.
+
+    Args:
+        model_name: Gemini model name
+
+    Returns:
+        genai.GenerativeModel for the model
+    """
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name)
+
 
 class GeminiModel(Enum):
     """Available Gemini models with their daily limits and characteristics."""
@@ -69,17 +221,19 @@ class Summarizer:
 
             # Configure Gemini
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel(self.config.default_model)
+            self.model = _get_gemini_model(self.config.default_model)
             self.genai = genai
 
         elif self.provider == "ollama":
-            import ollama
-            self.ollama_client = ollama.Client(host=self.config.ollama_host)
+            self.ollama_client = _get_ollama_client(self.config.ollama_host)
             self.model_name = self.config.ollama_model
 
         else:
             raise ValueError(f"Unknown summarization provider: {self.provider}")
 
+        # Summaries already generated for an identical prompt (see _cache_path)
+        self.cache_dir = Path.home() / ".ai-session" / "summary_cache"
+
     def test_connection(self) -> dict:
         """Test the summarization provider connection.
 
@@ -277,41 +431,142 @@ class Summarizer:
         finally:
             db.close()
 
-    def summarize_session(self, transcript: str, max_length: int = 2000) -> Optional[str]:
-        """Summarize a session transcript.
+    def _cache_path(self, prompt: str) -> Path:
+        """Locate the cached summary for a prompt.
+
+        The key covers the provider, model and the complete prompt (template,
+        limits and content), so a changed prompt or model never hits a stale
+        entry.
 
         Args:
-            transcript: Full session transcript
+            prompt: Prompt sent to the provider
+
+        Returns:
+            Path of the cache file (which may not exist)
+        """
+        model_name = self.config.default_model if self.provider == "gemini" else self.model_name
+        digest = hashlib.blake2b(f"{self.provider}|{model_name}|".encode(), digest_size=20)
+        digest.update(prompt.encode("utf-8", errors="surrogatepass"))
+        return self.cache_dir / f"{digest.hexdigest()}.txt"
+
+    def _get_cached_summary(self, prompt: str) -> Optional[str]:
+        """Return the summary previously generated for this prompt, if any."""
+        cache_path = self._cache_path(prompt)
+        try:
+            summary = cache_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+        # Mark the entry as recently used so pruning keeps it
+        with contextlib.suppress(OSError):
+            os.utime(cache_path)
+        return summary
+
+    def _cache_summary(self, prompt: str, summary: str) -> None:
+        """Remember a successfully generated summary for this prompt.
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent summarize_sessions() workers never read a partial entry.
+        """
+        cache_path = self._cache_path(prompt)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(summary, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+            self._prune_summary_cache()
+        except OSError:
+            # Caching is best-effort
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+
+    def _prune_summary_cache(self) -> None:
+        """Delete the least recently used entries beyond SUMMARY_CACHE_MAX_ENTRIES."""
+        entries = []
+        for path in self.cache_dir.glob("*.txt"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue  # Removed by a concurrent prune
+
+        excess = len(entries) - SUMMARY_CACHE_MAX_ENTRIES
+        if excess <= 0:
+            return
+
+        entries.sort()
+        for _, path in entries[:excess]:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read_stream(pieces, max_length: int) -> str:
+        """Collect a streamed response, stopping once it exceeds max_length.
+
+        Anything past max_length would be truncated anyway, so the stream is
+        abandoned there instead of waiting for (and paying for) the rest.
+
+        Args:
+            pieces: Iterable of response text fragments
             max_length: Maximum summary length in characters
 
         Returns:
-            Summary text or None if failed
+            The collected response text, stripped
         """
-        if not transcript or len(transcript) < 50:
-            return "Session too short to summarize."
+        parts = []
+        length = 0
+        for piece in pieces:
+            parts.append(piece)
+            length += len(piece)
+            if length > max_length:
+                break
+        return "".join(parts).strip()
+
+    def _condense_transcript(self, transcript: str) -> str:
+        """Shrink a transcript to fit the Ollama prompt by summarizing its parts.
+
+        The transcript is split into overlapping parts that are summarized
+        concurrently (map); the caller then summarizes the joined part
+        summaries with the regular session prompt (reduce). Unlike cutting
+        out the middle, every part of the session contributes.
 
-        # Clean transcript first - removes ANSI codes and deduplicates
-        original_size = len(transcript)
-        transcript = clean_transcript(transcript)
-        cleaned_size = len(transcript)
-        reduction = ((original_size - cleaned_size) / original_size * 100)
-        print(f"  Cleaned transcript: {original_size:,} → {cleaned_size:,} chars ({reduction:.1f}% reduction)")
+        Args:
+            transcript: Cleaned transcript longer than OLLAMA_MAX_TRANSCRIPT_CHARS
+
+        Returns:
+            Part summaries, in order, clipped to OLLAMA_MAX_TRANSCRIPT_CHARS
+        """
+        for _ in range(CONDENSE_MAX_ROUNDS):
+            if len(transcript) <= OLLAMA_MAX_TRANSCRIPT_CHARS:
+                break
+
+            parts = _chunk_by_chars(transcript, CONDENSE_CHUNK_CHARS, CONDENSE_CHUNK_OVERLAP)
+            print(f"  Condensing transcript: summarizing {len(parts)} parts...")
+
+            def summarize_part(numbered_part):
+                number, part = numbered_part
+                response = self.ollama_client.generate(
+                    model=self.model_name,
+                    prompt=f"""Summarize part {number} of {len(parts)} of a development session transcript in at most 300 characters.
+Focus on what was built or fixed, technical decisions, files touched, and issues hit.
+
+TRANSCRIPT PART:
+{part}
+
+SUMMARY:"""
+                )
+                summary = response['response'].strip()[:CONDENSE_PART_SUMMARY_CHARS]
+                return f"[Part {number}/{len(parts)}] {summary}"
+
+            with ThreadPoolExecutor(max_workers=min(SUMMARY_WORKERS, len(parts))) as executor:
+                summaries = list(executor.map(summarize_part, enumerate(parts, 1)))
+
+            transcript = "\n\n".join(summaries)
+
+        return transcript[:OLLAMA_MAX_TRANSCRIPT_CHARS]
 
-        # Trim very large transcripts for Ollama (smaller context window)
-        # Gemini 2.0 Flash has 1M token context, so no trimming needed
-        if self.provider == "ollama":
-            # Target: ~30k tokens = ~60k characters (fits Qwen 2.5 32k context)
-            max_chars = 60000
-            if len(transcript) > max_chars:
-                # Take evenly from beginning, middle, and end for better coverage
-                chunk_size = max_chars // 3
-                first_part = transcript[:chunk_size]
-                middle_start = len(transcript) // 2 - (chunk_size // 2)
-                middle_part = transcript[middle_start:middle_start + chunk_size]
-                last_part = transcript[-chunk_size:]
-                transcript = f"{first_part}\n\n[... section omitted ...]\n\n{middle_part}\n\n[... section omitted ...]\n\n{last_part}"
-
-        prompt = f"""You are an expert development session analyzer for Chronicle, a tool that tracks AI-assisted coding sessions.
+    @staticmethod
+    def _session_prompt(transcript: str, max_length: int) -> str:
+        """Build the session summary prompt for a cleaned transcript."""
+        return f"""You are an expert development session analyzer for Chronicle, a tool that tracks AI-assisted coding sessions.
 
 TASK: Analyze this terminal session transcript and create a concise, actionable summary.
 
@@ -343,41 +598,80 @@ SESSION TRANSCRIPT:
 
 SUMMARY:"""
 
-        import time
+    def summarize_session(self, transcript: str, max_length: int = 2000) -> Optional[str]:
+        """Summarize a session transcript.
+
+        Args:
+            transcript: Full session transcript
+            max_length: Maximum summary length in characters
+
+        Returns:
+            Summary text or None if failed
+        """
+        if not transcript or len(transcript) < 50:
+            return "Session too short to summarize."
+
+        # Clean transcript first - removes ANSI codes and deduplicates
+        original_size = len(transcript)
+        transcript = clean_transcript(transcript)
+        cleaned_size = len(transcript)
+        reduction = ((original_size - cleaned_size) / original_size * 100)
+        print(f"  Cleaned transcript: {original_size:,} → {cleaned_size:,} chars ({reduction:.1f}% reduction)")
+
+        # Mostly terminal noise: skip the provider round trip entirely
+        if cleaned_size < MIN_SUMMARY_TRANSCRIPT_CHARS:
+            return "Session too short to summarize."
+
+        prompt = self._session_prompt(transcript, max_length)
+
+        # The cache is keyed on the full cleaned transcript, so a hit also
+        # skips condensing (whose output varies from run to run)
+        cache_key = prompt
+        cached = self._get_cached_summary(cache_key)
+        if cached is not None:
+            return cached
+
+        # Condense very large transcripts for Ollama (smaller context window)
+        # Gemini 2.0 Flash has 1M token context, so no condensing needed
+        if self.provider == "ollama" and len(transcript) > OLLAMA_MAX_TRANSCRIPT_CHARS:
+            try:
+                prompt = self._session_prompt(self._condense_transcript(transcript), max_length)
+            except Exception as e:
+                return f"Error generating summary: {str(e)}"
 
         max_retries = 3
         for attempt in range(max_retries):
             try:
                 if self.provider == "gemini":
-                    response = self.model.generate_content(prompt)
-                    summary = response.text.strip()
+                    stream = self.model.generate_content(prompt, stream=True)
+                    summary = self._read_stream((_gemini_chunk_text(chunk) for chunk in stream), max_length)
                 elif self.provider == "ollama":
-                    response = self.ollama_client.generate(
+                    stream = self.ollama_client.generate(
                         model=self.model_name,
-                        prompt=prompt
+                        prompt=prompt,
+                        stream=True
                     )
-                    summary = response['response'].strip()
+                    summary = self._read_stream((chunk['response'] for chunk in stream), max_length)
                 else:
                     return f"Unknown provider: {self.provider}"
 
+                # Nothing usable came back (e.g. the response was blocked);
+                # don't cache it so the next run asks again
+                if not summary:
+                    return "Error generating summary: empty response"
+
                 # Ensure summary isn't too long
                 if len(summary) > max_length:
                     summary = summary[:max_length-3] + "..."
 
+                self._cache_summary(cache_key, summary)
                 return summary
             except Exception as e:
                 error_str = str(e)
                 # Check if it's a rate limit error (Gemini only)
                 if self.provider == "gemini" and ("429" in error_str or "quota" in error_str.lower()):
                     if attempt < max_retries - 1:
-                        # Extract retry delay if available
-                        import re
-                        match = re.search(r'retry in (\d+\.?\d*)s', error_str)
-                        if match:
-                            delay = float(match.group(1)) + 1  # Add 1 second buffer
-                        else:
-                            delay = 10 * (attempt + 1)  # Exponential backoff
-
+                        delay = _retry_delay(error_str, attempt, base=10, hint_buffer=1)
                         print(f"  Rate limit hit, retrying in {delay:.1f}s...")
                         time.sleep(delay)
                         continue
@@ -386,6 +680,26 @@ SUMMARY:"""
 
         return "Error: Rate limit exceeded after retries"
 
+    def summarize_sessions(self, transcripts: List[str], max_length: int = 2000) -> List[Optional[str]]:
+        """Summarize several session transcripts concurrently.
+
+        Each summary is a network round trip to the provider, so running them
+        on a small thread pool overlaps the waiting instead of paying it once
+        per transcript.
+
+        Args:
+            transcripts: Full session transcripts
+            max_length: Maximum summary length in characters
+
+        Returns:
+            Summaries in the same order as the transcripts
+        """
+        if not transcripts:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(SUMMARY_WORKERS, len(transcripts))) as executor:
+            return list(executor.map(lambda t: self.summarize_session(t, max_length), transcripts))
+
     def summarize_day(self, commits: list, interactions: list) -> Optional[str]:
         """Summarize a day's worth of development activity.
 
@@ -396,19 +710,20 @@ SUMMARY:"""
         Returns:
             Summary text or None if failed
         """
-        # Build context from commits and interactions
-        context = "Daily Development Summary\n\n"
+        # Build context from commits and interactions; repeated entries
+        # ("fix typo", re-asked prompts) are listed once with a count
+        context_lines = ["Daily Development Summary", ""]
 
         if commits:
-            context += "Git Commits:\n"
-            for commit in commits:
-                context += f"- {commit}\n"
-            context += "\n"
+            context_lines.append("Git Commits:")
+            context_lines.extend(f"- {commit}" for commit in _collapse_repeats(commits))
+            context_lines.append("")
 
         if interactions:
-            context += "AI Interactions:\n"
-            for interaction in interactions:
-                context += f"- {interaction}\n"
+            context_lines.append("AI Interactions:")
+            context_lines.extend(f"- {interaction}" for interaction in _collapse_repeats(interactions))
+
+        context = "\n".join(context_lines) + "\n"
 
         prompt = f"""Summarize this day of development activity in 200 words or less.
 
@@ -421,21 +736,28 @@ Focus on:
 
 Summary:"""
 
+        cached = self._get_cached_summary(prompt)
+        if cached is not None:
+            return cached
+
         try:
             if self.provider == "gemini":
                 response = self.model.generate_content(prompt)
-                return response.text.strip()
+                summary = response.text.strip()
             elif self.provider == "ollama":
                 response = self.ollama_client.generate(
                     model=self.model_name,
                     prompt=prompt
                 )
-                return response['response'].strip()
+                summary = response['response'].strip()
             else:
                 return f"Unknown provider: {self.provider}"
         except Exception as e:
             return f"Error generating summary: {str(e)}"
 
+        self._cache_summary(prompt, summary)
+        return summary
+
     def calculate_adaptive_delay(self, chunk_text: str, cumulative_summary: str) -> float:
         """Calculate delay needed to stay under Gemini rate limits (1M tokens/min).
 
@@ -709,10 +1031,8 @@ Updated Summary:"""
                         estimated_tokens = (len(chunk_text) + len(cumulative_summary)) / 4
                         self.recent_requests.append((time.time(), estimated_tokens))
 
-                        # Create a temporary client for this specific model
-                        import google.generativeai as genai
-                        temp_model = genai.GenerativeModel(model_name)
-                        response = temp_model.generate_content(prompt)
+                        # Use the shared handle for this specific model
+                        response = _get_gemini_model(model_name).generate_content(prompt)
                         chunk_summary = response.text.strip()
 
                         # Track usage for this model
@@ -737,20 +1057,13 @@ Updated Summary:"""
 
                     if attempt < max_retries - 1:  # Still have retries left
                         if is_rate_limit:
-                            # Extract retry delay if available
-                            import re
-                            match = re.search(r'retry in (\d+\.?\d*)s', error_str)
-                            if match:
-                                delay = float(match.group(1)) + 2  # Add 2 second buffer
-                            else:
-                                delay = 15 * (attempt + 1)  # 15s, 30s, 45s
-
+                            delay = _retry_delay(error_str, attempt, base=15, hint_buffer=2)
                             print(f"  ⚠️  Rate limit hit on chunk {chunk_num + 1}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})...")
                         else:
                             # Other error - use exponential backoff
-                            delay = 5 * (2 ** attempt)  # 5s, 10s, 20s
+                            delay = _retry_delay(error_str, attempt, base=5)
                             print(f"  ⚠️  Error on chunk {chunk_num + 1}: {error_str[:100]}")
-                            print(f"  Retrying in {delay}s (attempt {attempt + 1}/{max_retries})...")
+                            print(f"  Retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})...")
 
                         time.sleep(delay)
                     else:
@@ -0,0 +1,35 @@
+"""Git repository root discovery for Chronicle.
+
+Sessions and interactions record the repository they ran in. Looking that up
+walks the directory tree with a stat per level, so results are memoized per
+directory for the life of the process.
+"""
+
+import functools
+from pathlib import Path
+from typing import Optional
+
+
+def find_git_root(start_path: str) -> Optional[str]:
+    """Find the git repository root from a starting path.
+
+    Args:
+        start_path: Directory to start searching from
+
+    Returns:
+        Git repository root path or None if not in a git repo
+    """
+    return _find_git_root(str(Path(start_path).resolve()))
+
+
+@functools.lru_cache(maxsize=512)
+def _find_git_root(resolved_path: str) -> Optional[str]:
+    """Walk up from an already-resolved directory looking for .git."""
+    current = Path(resolved_path)
+
+    while current != current.parent:
+        if (current / ".git").exists():
+            return str(current)
+        current = current.parent
+
+    return None
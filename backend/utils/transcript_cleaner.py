@@ -6,6 +6,34 @@ control characters, and deduplicating repeated lines (like spinner redraws).
 
 import re
 
+# ANSI escape sequences (colors, cursor movement, mode changes, etc.) or,
+# failing that, any remaining control character other than newline and tab.
+# Compiled once and applied in a single substitution pass.
+_ANSI_CONTROL_PATTERN = re.compile(r'''
+    \x1B  # ESC
+    (?:   # Non-capturing group for alternatives
+        [@-Z\\-_]  # Single-character CSI
+    |
+        \[[0-?]*[ -/]*[@-~]  # CSI sequences (most common)
+    |
+        \][^\x07]*(?:\x07|\x1B\\)  # OSC sequences
+    |
+        P[^\x1B]*(?:\x1B\\)  # DCS sequences
+    |
+        _[^\x1B]*(?:\x1B\\)  # APC sequences
+    |
+        \^[^\x1B]*(?:\x1B\\)  # PM sequences
+    )
+  |
+    [\x00-\x08\x0B-\x1F\x7F]  # Control characters (preserves \n and \t)
+''', re.VERBOSE)
+
+# Control characters alone, for transcripts without any ESC byte
+_CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0B-\x1F\x7F]')
+
+# Runs of blank (or whitespace-only) lines
+_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n+')
+
 
 def clean_transcript(transcript: str) -> str:
     """Clean transcript by removing ANSI codes and deduplicating lines.
@@ -37,36 +65,22 @@ def clean_transcript(transcript: str) -> str:
     if not transcript:
         return ""
 
-    # 1. Remove ALL ANSI escape sequences (comprehensive pattern)
-    # Matches: ESC [ ... letter, ESC ( ... ), ESC ) ... ), and other ANSI codes
-    # This catches color codes, cursor movement, mode changes, etc.
-    ansi_pattern = re.compile(r'''
-        \x1B  # ESC
-        (?:   # Non-capturing group for alternatives
-            [@-Z\\-_]  # Single-character CSI
-        |
-            \[[0-?]*[ -/]*[@-~]  # CSI sequences (most common)
-        |
-            \][^\x07]*(?:\x07|\x1B\\)  # OSC sequences
-        |
-            P[^\x1B]*(?:\x1B\\)  # DCS sequences
-        |
-            _[^\x1B]*(?:\x1B\\)  # APC sequences
-        |
-            \^[^\x1B]*(?:\x1B\\)  # PM sequences
-        )
-    ''', re.VERBOSE)
-    cleaned = ansi_pattern.sub('', transcript)
-
-    # 2. Remove any remaining control characters (except newlines and tabs)
-    # Preserve \n (0x0A) and \t (0x09)
-    cleaned = re.sub(r'[\x00-\x08\x0B-\x1F\x7F]', '', cleaned)
+    # 1-2. Remove ALL ANSI escape sequences and any remaining control
+    # characters (except newlines and tabs) in one pass. Without an ESC byte
+    # (a fast substring check) no sequence can match, so the simpler
+    # control-character scan is enough.
+    if '\x1b' in transcript:
+        cleaned = _ANSI_CONTROL_PATTERN.sub('', transcript)
+    else:
+        cleaned = _CONTROL_PATTERN.sub('', transcript)
 
     # 3.5. Remove keystroke-by-keystroke UI redraws (Claude Code specific)
     # Strategy: A prompt is a "real message" if it's followed by actual content (not another prompt)
     # Keystroke redraws = prompt followed by another prompt shortly after
     # Real messages = prompt followed by assistant output, thinking, tool use, etc.
     lines = cleaned.split('\n')
+    # Only the line list is needed from here on; drop the text copy
+    del cleaned
     lines_to_skip = set()
 
     # Single pass: find all prompts and check what follows them
@@ -134,17 +148,12 @@ def clean_transcript(transcript: str) -> str:
 
         i += 1
 
-    # Build cleaned output, skipping marked lines
-    deduplicated_prompts = []
-    for i, line in enumerate(lines):
-        if i not in lines_to_skip:
-            deduplicated_prompts.append(line)
-
-    cleaned = '\n'.join(deduplicated_prompts)
+    # Keep working on the line list, skipping marked lines
+    # (stages only rejoin into a string where they need regex matching)
+    lines = [line for i, line in enumerate(lines) if i not in lines_to_skip]
 
     # 4. Remove decorator borders and spinner lines
     # These are purely visual and waste massive space (can be 50% of transcript!)
-    lines = cleaned.split('\n')
     cleaned_lines = []
     spinner_chars = ['·', '✢', '✳', '✶', '✻', '✽']
 
@@ -223,15 +232,17 @@ def clean_transcript(transcript: str) -> str:
 
         cleaned_lines.append(line)
     cleaned = '\n'.join(cleaned_lines)
+    del lines, cleaned_lines
 
     # 5. Collapse multiple blank lines (2+ newlines -> 1 newline)
     # This makes the transcript much more compact while still readable
-    cleaned = re.sub(r'\n\s*\n+', '\n', cleaned)
+    cleaned = _BLANK_LINES_PATTERN.sub('\n', cleaned)
 
     # 5.5. Deduplicate user prompts within a small window (removes UI redraws)
     # Claude Code redraws prompts multiple times (after spinners, thinking messages, etc.)
     # These appear within ~20 lines of each other - much closer than genuine re-asks
     lines = cleaned.split('\n')
+    del cleaned
     lines_to_skip_prompts = set()
 
     for i, line in enumerate(lines):
@@ -248,16 +259,10 @@ def clean_transcript(transcript: str) -> str:
                     break  # Only need to find one duplicate to mark this for deletion
 
     # Remove marked prompts
-    deduplicated_prompts = []
-    for i, line in enumerate(lines):
-        if i not in lines_to_skip_prompts:
-            deduplicated_prompts.append(line)
-
-    cleaned = '\n'.join(deduplicated_prompts)
+    lines = [line for i, line in enumerate(lines) if i not in lines_to_skip_prompts]
 
     # 6. Deduplicate consecutive identical lines (handles remaining duplicates)
     # Skip blank lines when comparing - they don't break duplication runs
-    lines = cleaned.split('\n')
     deduplicated = []
     prev_line = None
     prev_normalized = None
@@ -306,12 +311,11 @@ def clean_transcript(transcript: str) -> str:
             prev_line = stripped
             prev_normalized = normalized
 
-    cleaned = '\n'.join(deduplicated)
+    lines = deduplicated
 
     # 6.5. Deduplicate multi-line blocks (MCP responses, AI summaries, etc.)
     # These appear as consecutive line groups that repeat (often 10+ times)
     # Strategy: Use a sliding window to detect repeating 3-5 line patterns
-    lines = cleaned.split('\n')
     multiline_deduplicated = []
     skip_until = -1  # Track which lines to skip
 
@@ -368,13 +372,12 @@ def clean_transcript(transcript: str) -> str:
 
         i += 1
 
-    cleaned = '\n'.join(multiline_deduplicated)
+    lines = multiline_deduplicated
 
     # 7. Final pass: Remove keystroke-by-keystroke typing that survived earlier steps
     # After removing all decorations, keystrokes end up consecutive
     # Pattern: "> w" followed by "> wh" followed by "> why" etc.
     # Also handles typos/corrections: "> I tihn" → "> I tih" → "> I think"
-    lines = cleaned.split('\n')
     final_lines = []
     skip_next = set()
 
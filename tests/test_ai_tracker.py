@@ -96,6 +96,18 @@ def test_search_interactions(temp_db):
     assert "JavaScript" in results[0].prompt
 
 
+def test_search_interactions_full_text(temp_db):
+    """Test word-prefix matching and that FTS5 syntax in the term is literal."""
+    tracker = AITracker(temp_db)
+
+    tracker.log_interaction("claude-code", "Refactor the database layer")
+    tracker.log_interaction("claude-code", "Write migration tests")
+
+    assert len(tracker.search_interactions("migr")) == 1
+    assert tracker.search_interactions('database OR "tests') == []
+    assert tracker.search_interactions("  ") == []
+
+
 def test_link_to_commit(temp_db):
     """Test linking AI interaction to a commit."""
     tracker = AITracker(temp_db)
@@ -192,3 +204,71 @@ def test_files_mentioned(temp_db):
     assert "auth.py" in interaction.files_list
     assert "middleware.py" in interaction.files_list
     assert "tests/test_auth.py" in interaction.files_list
+
+
+def test_linked_commits_loaded_with_interactions(temp_db):
+    """Test that listing interactions loads linked commits without per-row queries."""
+    from sqlalchemy import event
+
+    now = datetime.now()
+    commit = Commit(
+        timestamp=now + timedelta(minutes=5),
+        sha="c" * 40,
+        message="Linked commit",
+        repo_path="/tmp/repo",
+    )
+    temp_db.add(commit)
+    temp_db.commit()
+
+    tracker = AITracker(temp_db)
+    for i in range(3):
+        tracker.log_interaction(ai_tool="claude-code", prompt=f"Prompt {i}", working_directory="/tmp")
+    temp_db.expunge_all()
+
+    statements = []
+    engine = temp_db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        interactions = tracker.get_interactions_today()
+        shas = [i.commit.sha for i in interactions]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert shas == ["c" * 40] * 3
+    assert len(statements) == 2  # interactions + one batched commit load
+
+
+def test_link_interactions_batch(temp_db):
+    """Test batch linking picks the first commit inside each window."""
+    base = datetime(2025, 1, 1, 12, 0)
+    commits = [
+        Commit(timestamp=base + timedelta(minutes=m), sha=f"{m:040d}", message=f"Commit {m}", repo_path="/tmp/repo")
+        for m in (10, 20, 120)
+    ]
+    temp_db.add_all(commits)
+    interactions = [
+        AIInteraction(timestamp=base + timedelta(minutes=m), ai_tool="claude-code", prompt=f"Prompt {m}")
+        for m in (0, 15, 45, 100)
+    ]
+    temp_db.add_all(interactions)
+    temp_db.commit()
+
+    tracker = AITracker(temp_db)
+    linked = tracker.link_interactions_batch(interactions)
+
+    assert linked == 3
+    assert [i.related_commit_id for i in interactions] == [
+        commits[0].id, commits[1].id, None, commits[2].id
+    ]
+
+
+def test_find_git_root(tmp_path):
+    """Test git root discovery from a nested directory."""
+    (tmp_path / ".git").mkdir()
+    nested = tmp_path / "src" / "pkg"
+    nested.mkdir(parents=True)
+
+    tracker = AITracker(None)
+    assert tracker._find_git_root(str(nested)) == str(tmp_path.resolve())
+    assert tracker._find_git_root(str(tmp_path)) == str(tmp_path.resolve())
@@ -153,3 +153,128 @@ def test_non_git_directory(temp_db):
     with tempfile.TemporaryDirectory() as tmpdir:
         with pytest.raises(ValueError, match="Not a valid git repository"):
             monitor.scan_repo(tmpdir)
+
+
+def test_scan_relative_path_no_duplicates(temp_db, temp_git_repo, monkeypatch):
+    """Test that rescanning via a relative path recognizes stored commits."""
+    monitor = GitMonitor(temp_db)
+    monitor.scan_repo(temp_git_repo, limit=10)
+
+    monkeypatch.chdir(os.path.dirname(temp_git_repo))
+    commits = monitor.scan_repo(os.path.basename(temp_git_repo), limit=10)
+
+    assert commits == []
+    assert temp_db.query(Commit).count() == 2
+
+
+def test_scan_repo_records_files_changed(temp_db, temp_git_repo):
+    """Test that each scanned commit records the files it touched."""
+    repo = Repo(temp_git_repo)
+    with open(os.path.join(temp_git_repo, 'other.txt'), 'w') as f:
+        f.write('other')
+    repo.index.add(['other.txt'])
+    repo.index.commit('Add other file')
+
+    monitor = GitMonitor(temp_db)
+    commits = monitor.scan_repo(temp_git_repo, limit=10)
+
+    files = {c.message: c.files_list for c in commits}
+    assert files['Add other file'] == ['other.txt']
+    assert files['Update test file'] == ['test.txt']
+    assert files['Initial commit'] == ['test.txt']
+
+
+def test_scan_repo_detached_head(temp_db, temp_git_repo):
+    """Test scanning a repository whose HEAD is detached."""
+    repo = Repo(temp_git_repo)
+    repo.git.checkout(repo.head.commit.hexsha)
+
+    monitor = GitMonitor(temp_db)
+    commits = monitor.scan_repo(temp_git_repo, limit=10)
+
+    assert len(commits) == 2
+    assert all(c.branch == 'unknown' for c in commits)
+
+
+def test_scan_repos(temp_db, temp_git_repo):
+    """Test scanning several repositories in one call."""
+    with tempfile.TemporaryDirectory() as other_dir:
+        other = Repo.init(other_dir)
+        with open(os.path.join(other_dir, 'other.txt'), 'w') as f:
+            f.write('other')
+        other.index.add(['other.txt'])
+        other.index.commit('Other repo commit')
+
+        monitor = GitMonitor(temp_db)
+        commits = monitor.scan_repos([temp_git_repo, other_dir], limit=10)
+
+        assert [c.message for c in commits] == ['Update test file', 'Initial commit', 'Other repo commit']
+        assert {c.repo_path for c in commits} == {os.path.abspath(temp_git_repo), os.path.abspath(other_dir)}
+
+        # A second pass finds nothing new
+        assert monitor.scan_repos([temp_git_repo, other_dir], limit=10) == []
+
+
+def test_scan_repo_on_upgraded_database(temp_git_repo, tmp_path):
+    """Test that a database from before the unique commit index can be scanned."""
+    import sqlite3
+
+    db_path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE commits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME NOT NULL,
+            sha VARCHAR(40) NOT NULL,
+            message TEXT NOT NULL,
+            files_changed TEXT,
+            branch VARCHAR(255),
+            author VARCHAR(255),
+            repo_path VARCHAR(500) NOT NULL
+        );
+        CREATE TABLE ai_interactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME NOT NULL,
+            ai_tool VARCHAR(50) NOT NULL,
+            prompt TEXT NOT NULL,
+            response_summary TEXT,
+            files_mentioned TEXT,
+            duration_ms INTEGER,
+            related_commit_id INTEGER REFERENCES commits (id)
+        );
+    """)
+    conn.close()
+
+    engine, SessionLocal = init_db(db_path)
+    session = SessionLocal()
+    monitor = GitMonitor(session)
+
+    assert len(monitor.scan_repo(temp_git_repo, limit=10)) == 2
+    assert monitor.scan_repo(temp_git_repo, limit=10) == []
+
+    session.close()
+    engine.dispose()
+
+
+def test_scan_repo_with_duplicate_commits(temp_git_repo, tmp_path):
+    """Test scanning a database whose duplicate commits block the unique index."""
+    import sqlite3
+
+    db_path = str(tmp_path / 'dupes.db')
+    engine, SessionLocal = init_db(db_path)
+    engine.dispose()
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        DROP INDEX uq_commit_sha_repo;
+        INSERT INTO commits (timestamp, sha, message, repo_path) VALUES ('2025-01-01', 'abc', 'msg', '/repo');
+        INSERT INTO commits (timestamp, sha, message, repo_path) VALUES ('2025-01-01', 'abc', 'msg', '/repo');
+    """)
+    conn.close()
+
+    session = SessionLocal()
+    monitor = GitMonitor(session)
+
+    assert len(monitor.scan_repo(temp_git_repo, limit=10)) == 2
+    assert monitor.scan_repo(temp_git_repo, limit=10) == []
+
+    session.close()
@@ -0,0 +1,398 @@
+"""Tests for the Chronicle MCP server tools."""
+
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy.orm import scoped_session
+
+from backend.database.models import (
+    init_db,
+    AIInteraction,
+    Commit,
+    SessionSummaryChunk,
+    ProjectMilestone,
+)
+from backend.mcp import server
+
+
+@pytest.fixture
+def temp_db(monkeypatch):
+    """Create a temporary database and point the MCP server at it."""
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+        db_path = f.name
+
+    engine, SessionLocal = init_db(db_path)
+    session = SessionLocal()
+    monkeypatch.setattr(server, '_Session', scoped_session(SessionLocal))
+    server.clear_response_cache()
+
+    yield session
+
+    session.close()
+    os.unlink(db_path)
+
+
+@pytest.fixture
+def populated_db(temp_db):
+    """Populate the database with a few sessions and commits."""
+    now = datetime.now()
+
+    commit = Commit(
+        timestamp=now - timedelta(hours=1),
+        sha='a' * 40,
+        message='Add timeline support',
+        branch='main',
+        author='Dev <dev@example.com>',
+        repo_path='/home/dev/chronicle',
+    )
+    commit.files_list = ['backend/mcp/server.py']
+    temp_db.add(commit)
+    temp_db.add(Commit(
+        timestamp=now - timedelta(days=3),
+        sha='b' * 40,
+        message='Fix migration bug',
+        branch='main',
+        author='Other <other@example.com>',
+        repo_path='/home/dev/other',
+    ))
+
+    temp_db.add(AIInteraction(
+        timestamp=now - timedelta(minutes=30),
+        ai_tool='claude-session',
+        prompt='Interactive session (12.0m)',
+        response_summary='Built the MCP timeline tool',
+        duration_ms=720000,
+        is_session=1,
+        summary_generated=1,
+        repo_path='/home/dev/chronicle',
+        working_directory='/home/dev/chronicle',
+    ))
+    temp_db.add(AIInteraction(
+        timestamp=now - timedelta(hours=2),
+        ai_tool='gemini-session',
+        prompt='Interactive session (3.0m)',
+        response_summary='Investigated database size',
+        duration_ms=180000,
+        is_session=1,
+        repo_path='/home/dev/chronicle',
+    ))
+    temp_db.add(AIInteraction(
+        timestamp=now - timedelta(minutes=5),
+        ai_tool='claude-code',
+        prompt='Not a session',
+        is_session=0,
+    ))
+    temp_db.commit()
+
+    return temp_db
+
+
+def test_get_sessions(populated_db):
+    """Test listing sessions newest first."""
+    result = json.loads(server.get_sessions())
+
+    assert result['count'] == 2
+    assert [s['tool'] for s in result['sessions']] == ['claude-session', 'gemini-session']
+    assert result['sessions'][0]['duration_minutes'] == 12.0
+    assert result['sessions'][0]['is_session'] is True
+    # Timestamps are serialized as ISO 8601 strings
+    datetime.fromisoformat(result['sessions'][0]['timestamp'])
+
+
+def test_list_tools_skip_transcripts(populated_db):
+    """Test that listing sessions never reads the transcript column."""
+    from sqlalchemy import event
+
+    statements = []
+    engine = populated_db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        server.get_sessions()
+        server.get_timeline(days=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert statements
+    assert not any('session_transcript' in sql for sql in statements)
+
+
+def test_get_sessions_filters(populated_db):
+    """Test filtering sessions by tool and repository."""
+    result = json.loads(server.get_sessions(tool='gemini-session'))
+    assert result['count'] == 1
+
+    result = json.loads(server.get_sessions(repo_path='/home/dev/chronicle'))
+    assert result['count'] == 2
+
+    # Absolute paths match the repository and its subdirectories, not siblings
+    result = json.loads(server.get_sessions(repo_path='/home/dev/chronicle/'))
+    assert result['count'] == 2
+    result = json.loads(server.get_sessions(repo_path='/home/dev'))
+    assert result['count'] == 2
+    result = json.loads(server.get_commits(repo_path='/home/dev/chron'))
+    assert result['count'] == 0
+    # Bare names still match anywhere in the path
+    result = json.loads(server.get_commits(repo_path='other'))
+    assert result['count'] == 1
+
+
+def test_repo_filter_expands_home(populated_db, monkeypatch):
+    """Test that ~-relative repository paths use the anchored match."""
+    monkeypatch.setenv('HOME', '/home/dev')
+
+    result = json.loads(server.get_sessions(repo_path='~/chronicle'))
+    assert result['count'] == 2
+
+
+def test_get_session_summary(populated_db):
+    """Test session detail includes chunked summaries."""
+    session = populated_db.query(AIInteraction).filter_by(ai_tool='claude-session').first()
+    populated_db.add(SessionSummaryChunk(
+        session_id=session.id,
+        chunk_number=1,
+        chunk_start_line=0,
+        chunk_end_line=100,
+        chunk_summary='First chunk',
+        cumulative_summary='First chunk',
+    ))
+    populated_db.commit()
+
+    result = json.loads(server.get_session_summary(session.id))
+
+    assert result['id'] == session.id
+    assert result['chunked_summaries'] == [
+        {'chunk_number': 1, 'lines': '0-100', 'summary': 'First chunk'}
+    ]
+
+    missing = json.loads(server.get_session_summary(9999))
+    assert 'error' in missing
+
+
+def test_get_session_summary_single_query(populated_db):
+    """Test session detail loads chunks in the same query, in chunk order."""
+    from sqlalchemy import event
+
+    session = populated_db.query(AIInteraction).filter_by(ai_tool='claude-session').first()
+    for number in (2, 1):
+        populated_db.add(SessionSummaryChunk(
+            session_id=session.id,
+            chunk_number=number,
+            chunk_start_line=(number - 1) * 100,
+            chunk_end_line=number * 100,
+            chunk_summary=f'Chunk {number}',
+            cumulative_summary=f'Chunk {number}',
+        ))
+    populated_db.commit()
+    session_id = session.id
+
+    statements = []
+    engine = populated_db.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = json.loads(server.get_session_summary(session_id))
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [c['chunk_number'] for c in result['chunked_summaries']] == [1, 2]
+    assert len(statements) == 1
+
+
+def test_search_sessions(populated_db):
+    """Test searching session summaries."""
+    result = json.loads(server.search_sessions('timeline'))
+
+    assert result['count'] == 1
+    assert result['sessions'][0]['summary'] == 'Built the MCP timeline tool'
+
+
+def test_search_sessions_full_text(populated_db):
+    """Test full-text matching: prefixes, column restriction and index updates."""
+    assert json.loads(server.search_sessions('timel'))['count'] == 1
+    assert json.loads(server.search_sessions('timeline', search_summaries=False))['count'] == 0
+    # FTS5 operators in the query are matched literally instead of raising
+    assert json.loads(server.search_sessions('database OR "size'))['count'] == 0
+
+    session = populated_db.query(AIInteraction).filter_by(ai_tool='gemini-session').first()
+    session.response_summary = 'Profiled the timeline queries'
+    populated_db.commit()
+    server.clear_response_cache()
+
+    assert json.loads(server.search_sessions('timeline'))['count'] == 2
+    assert json.loads(server.search_sessions('database'))['count'] == 0
+
+
+def test_get_commits(populated_db):
+    """Test listing and filtering commits."""
+    result = json.loads(server.get_commits())
+    assert result['count'] == 2
+    assert result['commits'][0]['files_changed'] == ['backend/mcp/server.py']
+
+    result = json.loads(server.get_commits(days=1))
+    assert result['count'] == 1
+
+
+def test_search_commits(populated_db):
+    """Test searching commit messages."""
+    result = json.loads(server.search_commits('migration'))
+
+    assert result['count'] == 1
+    assert result['commits'][0]['message'] == 'Fix migration bug'
+
+
+def test_get_timeline(populated_db):
+    """Test the combined timeline is ordered newest first."""
+    result = json.loads(server.get_timeline(days=1))
+
+    assert result['commits_count'] == 1
+    assert result['sessions_count'] == 2
+    assert result['truncated'] is False
+    assert [item['type'] for item in result['timeline']] == ['session', 'commit', 'session']
+
+
+def test_get_timeline_limit_and_filter(populated_db, monkeypatch):
+    """Test the timeline keeps only the newest entries and honours repo filters."""
+    monkeypatch.setattr(server, 'TIMELINE_ITEMS_PER_DAY', 2)
+    monkeypatch.setattr(server, 'TIMELINE_BATCH_SIZE', 1)
+    result = json.loads(server.get_timeline(days=1))
+    assert [item['type'] for item in result['timeline']] == ['session', 'commit']
+    # Counts cover everything in range, not just the returned items
+    assert result['truncated'] is True
+    assert (result['total_items'], result['sessions_count'], result['commits_count']) == (3, 2, 1)
+
+    result = json.loads(server.get_timeline(days=7, repo_path='other'))
+    assert [item['data']['sha'] for item in result['timeline']] == ['b' * 40]
+    assert result['truncated'] is False
+
+
+def test_get_timeline_rejects_empty_range(populated_db):
+    """Test that a timeline of zero or negative days is an error, not an empty result."""
+    for days in (0, -3):
+        assert 'error' in json.loads(server.get_timeline(days=days))
+
+
+def test_get_stats(populated_db):
+    """Test usage statistics."""
+    result = json.loads(server.get_stats(days=7))
+
+    assert result['total_sessions'] == 2
+    assert result['total_commits'] == 2
+    assert result['total_duration_minutes'] == 15.0
+    assert result['sessions_by_tool'] == {'claude-session': 1, 'gemini-session': 1}
+    assert sorted(result['repositories']) == ['/home/dev/chronicle', '/home/dev/other']
+    assert result['unique_repositories'] == 2
+
+
+def test_get_milestone(populated_db):
+    """Test milestone detail includes linked sessions and commits."""
+    session = populated_db.query(AIInteraction).filter_by(ai_tool='claude-session').first()
+    milestone = ProjectMilestone(title='Timeline', milestone_type='feature', status='in_progress')
+    other = populated_db.query(AIInteraction).filter_by(ai_tool='gemini-session').first()
+    milestone.sessions_list = [other.id, session.id]
+    milestone.commits_list = ['a' * 40]
+    populated_db.add(milestone)
+    populated_db.commit()
+
+    result = json.loads(server.get_milestone(milestone.id))
+
+    assert result['title'] == 'Timeline'
+    # Linked items come back newest first
+    assert [s['id'] for s in result['linked_sessions']] == [session.id, other.id]
+    assert [c['sha'] for c in result['linked_commits']] == ['a' * 40]
+
+
+def test_tools_release_their_session(populated_db):
+    """Test each tool call gets a fresh, thread-local session."""
+    import threading
+
+    first = server.get_db()
+    server.get_sessions()
+    assert server.get_db() is not first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(server.get_db()))
+    thread.start()
+    thread.join()
+    assert other[0] is not server.get_db()
+
+
+def test_responses_are_cached_briefly(populated_db, monkeypatch):
+    """Test repeated identical calls are served from cache until the TTL bucket changes."""
+    now = [1000.0]
+    monkeypatch.setattr(server.time, 'monotonic', lambda: now[0])
+
+    first = server.get_sessions()
+    populated_db.add(AIInteraction(
+        timestamp=datetime.now(),
+        ai_tool='qwen-session',
+        prompt='Interactive session (1.0m)',
+        is_session=1,
+    ))
+    populated_db.commit()
+
+    assert server.get_sessions() == first
+    assert json.loads(server.get_sessions(limit=5))['count'] == 3
+
+    now[0] += server.RESPONSE_CACHE_TTL
+    assert json.loads(server.get_sessions())['count'] == 3
+
+
+def test_project_tools(temp_db):
+    """Test milestone and next-step tools round-trip through JSON."""
+    from backend.database.models import NextStep
+
+    milestone = ProjectMilestone(title='Search', milestone_type='feature', status='planned')
+    temp_db.add(milestone)
+    temp_db.commit()
+    step = NextStep(description='Add FTS index', related_milestone_id=milestone.id)
+    temp_db.add(step)
+    temp_db.commit()
+
+    assert json.loads(server.get_milestone(milestone.id))['status'] == 'planned'
+    result = json.loads(server.update_milestone_status(milestone.id, 'completed'))
+    assert result['new_status'] == 'completed'
+    # The write drops the cached milestone response
+    assert json.loads(server.get_milestone(milestone.id))['status'] == 'completed'
+
+    result = json.loads(server.complete_next_step(step.id))
+    datetime.fromisoformat(result['completed_at'])
+
+    roadmap = json.loads(server.get_roadmap())
+    assert [m['title'] for m in roadmap['recently_completed']] == ['Search']
+
+    assert 'error' in json.loads(server.update_milestone_status(milestone.id, 'bogus'))
+
+
+def test_get_roadmap_groups(temp_db):
+    """Test roadmap lists are limited, ordered and counted correctly."""
+    from backend.database.models import NextStep
+
+    now = datetime.now()
+    for i in range(12):
+        temp_db.add(ProjectMilestone(title=f'Planned {i}', status='planned', priority=5 - i % 5))
+    for i in range(11):
+        temp_db.add(ProjectMilestone(title=f'Active {i}', status='in_progress'))
+    temp_db.add(ProjectMilestone(title='Done recently', status='completed', completed_at=now - timedelta(days=1)))
+    temp_db.add(ProjectMilestone(title='Done today', status='completed', completed_at=now))
+    temp_db.add(ProjectMilestone(title='Done long ago', status='completed', completed_at=now - timedelta(days=30)))
+    temp_db.add(NextStep(description='Open step', priority=2))
+    temp_db.add(NextStep(description='Closed step', completed=1))
+    temp_db.commit()
+
+    roadmap = json.loads(server.get_roadmap(days=7))
+
+    assert len(roadmap['in_progress']) == 11
+    assert [m['title'] for m in roadmap['recently_completed']] == ['Done today', 'Done recently']
+    planned = roadmap['planned_high_priority']
+    assert len(planned) == 10
+    assert [m['priority'] for m in planned] == sorted(m['priority'] for m in planned)
+    assert [s['description'] for s in roadmap['pending_next_steps']] == ['Open step']
+    assert roadmap['summary'] == {
+        'total_milestones': 26,
+        'completed_milestones': 3,
+        'total_next_steps': 2,
+        'completed_next_steps': 1,
+    }
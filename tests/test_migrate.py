@@ -0,0 +1,363 @@
+"""Tests for database migrations."""
+
+import os
+import sqlite3
+import tempfile
+import pytest
+
+from backend.database.migrate import MIGRATIONS, run_all_migrations
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+V1_SCHEMA = """
+    CREATE TABLE commits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        sha VARCHAR(40) NOT NULL,
+        message TEXT NOT NULL,
+        files_changed TEXT,
+        branch VARCHAR(255),
+        author VARCHAR(255),
+        repo_path VARCHAR(500) NOT NULL
+    );
+    CREATE TABLE ai_interactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        ai_tool VARCHAR(50) NOT NULL,
+        prompt TEXT NOT NULL,
+        response_summary TEXT,
+        files_mentioned TEXT,
+        duration_ms INTEGER,
+        related_commit_id INTEGER REFERENCES commits (id)
+    );
+"""
+
+
+@pytest.fixture
+def v1_db():
+    """Create a temporary database with the original v1 schema."""
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+        db_path = f.name
+
+    conn = sqlite3.connect(db_path)
+    conn.executescript(V1_SCHEMA)
+    conn.execute(
+        "INSERT INTO ai_interactions (timestamp, ai_tool, prompt) "
+        "VALUES ('2025-01-01 10:00:00', 'claude-code', 'hello')"
+    )
+    conn.commit()
+    conn.close()
+
+    yield db_path
+
+    os.unlink(db_path)
+
+
+def _columns(db_path, table):
+    conn = sqlite3.connect(db_path)
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    conn.close()
+    return columns
+
+
+def _tables(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    conn.close()
+    return tables
+
+
+def test_migrate_v1_database(v1_db):
+    """Test that a v1 database is brought up to the latest schema."""
+    run_all_migrations(v1_db)
+
+    columns = _columns(v1_db, 'ai_interactions')
+    assert {'is_session', 'session_transcript', 'summary_generated'} <= columns
+    assert {'working_directory', 'repo_path'} <= columns
+    assert 'session_metadata' in columns
+
+    tables = _tables(v1_db)
+    assert {'project_milestones', 'next_steps', 'gemini_model_usage'} <= tables
+
+    # Existing rows survive the migration
+    conn = sqlite3.connect(v1_db)
+    row = conn.execute("SELECT prompt, is_session FROM ai_interactions").fetchone()
+    conn.close()
+    assert row == ('hello', 0)
+
+
+def test_migrations_are_idempotent(v1_db):
+    """Test that running migrations twice is a no-op."""
+    run_all_migrations(v1_db)
+    columns_before = _columns(v1_db, 'ai_interactions')
+
+    run_all_migrations(v1_db)
+
+    assert _columns(v1_db, 'ai_interactions') == columns_before
+
+
+def _indexes(db_path):
+    conn = sqlite3.connect(db_path)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    conn.close()
+    return indexes
+
+
+def _user_version(db_path):
+    conn = sqlite3.connect(db_path)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    return version
+
+
+def test_migrate_records_user_version(v1_db):
+    """Test that the applied schema version is stored in PRAGMA user_version."""
+    assert _user_version(v1_db) == 0
+
+    run_all_migrations(v1_db)
+
+    assert _user_version(v1_db) == LATEST_VERSION
+
+
+def test_migrate_moves_transcripts_out_of_database(v1_db):
+    """Test that v6 clears session transcripts stored in the database."""
+    run_all_migrations(v1_db)
+
+    # Simulate a v5 database that still has a transcript inline
+    conn = sqlite3.connect(v1_db)
+    conn.execute(
+        "INSERT INTO ai_interactions (timestamp, ai_tool, prompt, is_session, session_transcript) "
+        "VALUES ('2025-01-02 10:00:00', 'claude-session', 'session', 1, ?)",
+        ("x" * 10000,)
+    )
+    conn.execute("PRAGMA user_version = 5")
+    conn.commit()
+    conn.close()
+
+    run_all_migrations(v1_db)
+
+    conn = sqlite3.connect(v1_db)
+    count = conn.execute(
+        "SELECT COUNT(*) FROM ai_interactions WHERE session_transcript IS NOT NULL"
+    ).fetchone()[0]
+    total = conn.execute("SELECT COUNT(*) FROM ai_interactions").fetchone()[0]
+    conn.close()
+
+    assert count == 0
+    assert total == 2
+
+
+def _v5_database_with_transcript(db_path):
+    run_all_migrations(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO ai_interactions (timestamp, ai_tool, prompt, is_session, session_transcript) "
+        "VALUES ('2025-01-02 10:00:00', 'claude-session', 'session', 1, ?)",
+        ("x" * 100000,)
+    )
+    conn.execute("PRAGMA user_version = 5")
+    conn.commit()
+    conn.close()
+
+
+def test_compaction_keeps_live_database_file(v1_db):
+    """Test that compaction vacuums in place unless access is exclusive."""
+    _v5_database_with_transcript(v1_db)
+    inode = os.stat(v1_db).st_ino
+
+    run_all_migrations(v1_db)
+
+    # Other processes may hold the file open, so it must not be replaced
+    assert os.stat(v1_db).st_ino == inode
+    assert not os.path.exists(f"{v1_db}.vacuum.tmp")
+
+
+def test_exclusive_compaction_swaps_in_copy(v1_db):
+    """Test that exclusive migrations compact into a fresh file."""
+    _v5_database_with_transcript(v1_db)
+    size_before = os.path.getsize(v1_db)
+
+    run_all_migrations(v1_db, exclusive=True)
+
+    assert os.path.getsize(v1_db) < size_before
+    assert not os.path.exists(f"{v1_db}.vacuum.tmp")
+    assert _user_version(v1_db) == LATEST_VERSION
+
+
+def test_transcripts_cleared_in_batches(v1_db, monkeypatch):
+    """Test that transcripts spanning several batches are all cleared."""
+    from backend.database import migrate
+    monkeypatch.setattr(migrate, 'TRANSCRIPT_BATCH_SIZE', 2)
+
+    run_all_migrations(v1_db)
+
+    conn = sqlite3.connect(v1_db)
+    conn.executemany(
+        "INSERT INTO ai_interactions (timestamp, ai_tool, prompt, is_session, session_transcript) "
+        "VALUES ('2025-01-02 10:00:00', 'claude-session', 'session', 1, ?)",
+        [("transcript",)] * 5
+    )
+    conn.execute("PRAGMA user_version = 5")
+    conn.commit()
+    conn.close()
+
+    run_all_migrations(v1_db)
+
+    conn = sqlite3.connect(v1_db)
+    count = conn.execute(
+        "SELECT COUNT(*) FROM ai_interactions WHERE session_transcript IS NOT NULL"
+    ).fetchone()[0]
+    conn.close()
+
+    assert count == 0
+
+
+def test_fresh_install_skips_migrations():
+    """Test that a missing database is created directly at the latest version."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, 'sessions.db')
+
+        run_all_migrations(db_path)
+
+        assert _user_version(db_path) == LATEST_VERSION
+        assert {'ai_interactions', 'commits', 'project_milestones', 'gemini_model_usage'} <= _tables(db_path)
+        assert {'is_session', 'repo_path'} <= _columns(db_path, 'ai_interactions')
+
+
+def test_migrate_adds_composite_indexes(v1_db):
+    """Test that v7 adds the composite query indexes to existing tables."""
+    run_all_migrations(v1_db)
+
+    assert {'ix_ai_session_ts', 'ix_ai_tool_ts', 'ix_ai_repo_ts',
+            'ix_commit_repo_ts', 'ix_commit_author_ts'} <= _indexes(v1_db)
+
+
+def test_migrate_adds_roadmap_indexes(v1_db):
+    """Test that v8 adds the priority indexes to the project tracking tables."""
+    run_all_migrations(v1_db)
+
+    assert {'ix_milestone_status_priority', 'ix_nextstep_completed_priority'} <= _indexes(v1_db)
+
+
+def test_migrate_dedupes_commits(v1_db):
+    """Test that v9 removes duplicate commits and enforces uniqueness."""
+    conn = sqlite3.connect(v1_db)
+    conn.executemany(
+        "INSERT INTO commits (timestamp, sha, message, repo_path) VALUES ('2025-01-01 09:00:00', ?, 'msg', ?)",
+        [('abc', '/repo'), ('abc', '/repo'), ('abc', '/other')]
+    )
+    conn.execute("UPDATE ai_interactions SET related_commit_id = 2")
+    conn.commit()
+    conn.close()
+
+    run_all_migrations(v1_db)
+
+    assert 'uq_commit_sha_repo' in _indexes(v1_db)
+    conn = sqlite3.connect(v1_db)
+    ids = [row[0] for row in conn.execute("SELECT id FROM commits ORDER BY id")]
+    linked = conn.execute("SELECT related_commit_id FROM ai_interactions").fetchone()[0]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO commits (timestamp, sha, message, repo_path) VALUES ('2025-01-01', 'abc', 'msg', '/repo')")
+    conn.close()
+
+    assert ids == [1, 3]
+    assert linked == 1
+
+
+def test_init_db_keeps_duplicate_commits(v1_db):
+    """Test that opening a database never deletes duplicate commits."""
+    from backend.database.models import init_db
+
+    conn = sqlite3.connect(v1_db)
+    conn.executemany(
+        "INSERT INTO commits (timestamp, sha, message, repo_path) VALUES ('2025-01-01 09:00:00', ?, 'msg', ?)",
+        [('abc', '/repo'), ('abc', '/repo')]
+    )
+    conn.commit()
+    conn.close()
+
+    engine, SessionLocal = init_db(v1_db)
+    engine.dispose()
+
+    conn = sqlite3.connect(v1_db)
+    count = conn.execute("SELECT COUNT(*) FROM commits").fetchone()[0]
+    conn.close()
+
+    assert count == 2
+    assert 'uq_commit_sha_repo' not in _indexes(v1_db)
+    # v9 is left for the explicit migrate command
+    assert _user_version(v1_db) == 8
+
+
+def test_init_db_upgrades_existing_database(v1_db):
+    """Test that opening an old database applies the pending migrations."""
+    from backend.database.models import AIInteraction, init_db
+
+    engine, SessionLocal = init_db(v1_db)
+
+    assert _user_version(v1_db) == LATEST_VERSION
+    assert 'session_metadata' in _columns(v1_db, 'ai_interactions')
+
+    session = SessionLocal()
+    interaction = session.query(AIInteraction).first()
+    interaction.session_metadata = {'command': 'claude'}
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+def test_init_db_keeps_inline_transcripts(v1_db, tmp_path, monkeypatch):
+    """Test that opening a database never clears transcripts stored inline."""
+    from backend.database.models import init_db
+    from backend.services.session_manager import SessionManager
+
+    monkeypatch.setenv('HOME', str(tmp_path))
+    _v5_database_with_transcript(v1_db)
+
+    engine, SessionLocal = init_db(v1_db)
+    session = SessionLocal()
+    transcript = SessionManager(session).get_session_transcript(2)
+    session.close()
+    engine.dispose()
+
+    assert transcript == "x" * 100000
+    # v6 is left for the explicit migrate command
+    assert _user_version(v1_db) == 5
+    assert 'session_metadata' in _columns(v1_db, 'ai_interactions')
+
+    run_all_migrations(v1_db)
+    assert _user_version(v1_db) == LATEST_VERSION
+
+
+def test_migrate_drops_unused_indexes(v1_db):
+    """Test that v11 drops indexes that no query can use."""
+    run_all_migrations(v1_db)
+    conn = sqlite3.connect(v1_db)
+    conn.executescript("""
+        CREATE INDEX ix_gemini_model_usage_model_name ON gemini_model_usage (model_name);
+        CREATE INDEX ix_project_milestones_status ON project_milestones (status);
+        CREATE INDEX ix_commits_sha ON commits (sha);
+        CREATE INDEX ix_commits_repo_path ON commits (repo_path);
+        PRAGMA user_version = 10;
+    """)
+    conn.close()
+
+    run_all_migrations(v1_db)
+
+    assert not {'ix_gemini_model_usage_model_name', 'ix_gemini_model_usage_date',
+                'ix_project_milestones_status', 'ix_commits_sha',
+                'ix_commits_repo_path'} & _indexes(v1_db)
+    conn = sqlite3.connect(v1_db)
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM project_milestones WHERE status = 'in_progress'"
+    ))
+    conn.close()
+    assert 'ix_milestone_status_priority' in plan
+
+    conn = sqlite3.connect(v1_db)
+    plan = " ".join(row[3] for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM commits WHERE sha = 'abc'"
+    ))
+    conn.close()
+    assert 'uq_commit_sha_repo' in plan
@@ -230,3 +230,21 @@ def test_milestone_with_multiple_sessions(temp_db):
     assert len(result.sessions_list) == 2
     assert session1.id in result.sessions_list
     assert session2.id in result.sessions_list
+
+
+def test_milestone_lists_track_in_place_changes(temp_db):
+    """Test that appending to a loaded list column is persisted."""
+    milestone = ProjectMilestone(title="Lists", milestone_type="feature")
+    temp_db.add(milestone)
+    temp_db.commit()
+    temp_db.expire_all()
+
+    result = temp_db.query(ProjectMilestone).first()
+    assert result.tags_list == []
+    assert result.tags_list is result.tags_list  # Decoded once, not per access
+
+    result.tags_list.append("perf")
+    temp_db.commit()
+    temp_db.expire_all()
+
+    assert temp_db.query(ProjectMilestone).first().tags_list == ["perf"]
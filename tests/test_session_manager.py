@@ -0,0 +1,72 @@
+"""Tests for session management."""
+
+import os
+import tempfile
+from datetime import datetime
+import pytest
+
+from backend.database.models import init_db, AIInteraction
+from backend.services.session_manager import SessionManager
+
+
+@pytest.fixture
+def temp_db():
+    """Create a temporary database for testing."""
+    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
+        db_path = f.name
+
+    engine, SessionLocal = init_db(db_path)
+    session = SessionLocal()
+
+    yield session
+
+    session.close()
+    os.unlink(db_path)
+
+
+@pytest.fixture
+def manager(temp_db, tmp_path, monkeypatch):
+    """Create a session manager writing under a temporary home directory."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    return SessionManager(temp_db)
+
+
+def test_metadata_round_trip(manager, temp_db):
+    """Test that session metadata is stored on the session record."""
+    session = AIInteraction(
+        timestamp=datetime.now(),
+        ai_tool='claude-session',
+        prompt='Interactive claude session started',
+        is_session=1,
+    )
+    temp_db.add(session)
+    temp_db.commit()
+    metadata = {"session_id": session.id, "tool": "claude", "command": "claude --resume"}
+
+    manager._save_metadata(session.id, metadata)
+
+    assert manager._load_metadata(session.id) == metadata
+    assert not list(manager.session_dir.glob('*.meta'))
+
+
+def test_load_missing_metadata(manager):
+    """Test that a session without metadata loads as an empty dict."""
+    assert manager._load_metadata(99) == {}
+
+
+def test_get_session_transcript_reads_cleaned_file(manager, temp_db):
+    """Test that transcripts are read from the session's .cleaned file."""
+    session = AIInteraction(
+        timestamp=datetime.now(),
+        ai_tool='claude-session',
+        prompt='Interactive session (1.0m)',
+        is_session=1,
+    )
+    temp_db.add(session)
+    temp_db.commit()
+
+    assert manager.get_session_transcript(session.id) is None
+
+    (manager.session_dir / f"session_{session.id}.cleaned").write_text("cleaned transcript", encoding="utf-8")
+
+    assert manager.get_session_transcript(session.id) == "cleaned transcript"
@@ -0,0 +1,204 @@
+"""Tests for summarization helpers."""
+
+from types import SimpleNamespace
+
+from backend.services.summarizer import (
+    MAX_RETRY_DELAY, OLLAMA_MAX_TRANSCRIPT_CHARS, Summarizer, _chunk_by_chars, _collapse_repeats,
+    _retry_delay,
+)
+
+
+def test_retry_delay_uses_server_hint():
+    """Test that a suggested retry delay is honoured (plus buffer)."""
+    error = "429 Resource has been exhausted. Please retry in 12.5s."
+
+    assert _retry_delay(error, attempt=0, base=10, hint_buffer=1) == 13.5
+
+
+def test_retry_delay_backs_off_with_jitter():
+    """Test exponential backoff stays within its jitter bounds and cap."""
+    for attempt in range(8):
+        expected = min(MAX_RETRY_DELAY, 5 * 2 ** attempt)
+        delay = _retry_delay("connection reset", attempt, base=5)
+        assert 0.5 * expected <= delay <= 1.5 * expected
+
+
+def test_read_stream_stops_past_max_length():
+    """Test that streamed responses stop being read once too long."""
+    consumed = []
+
+    def pieces():
+        for piece in ["## What", " Was Built\n", "- thing", " more", " never read"]:
+            consumed.append(piece)
+            yield piece
+
+    assert Summarizer._read_stream(pieces(), max_length=20) == "## What Was Built\n- thing"
+    assert len(consumed) == 3
+    assert Summarizer._read_stream(iter([" short "]), max_length=20) == "short"
+
+
+def test_chunk_by_chars_overlaps_and_covers_text():
+    """Test that chunks overlap and together cover the whole text."""
+    text = "".join(chr(ord('a') + i % 26) for i in range(250))
+
+    chunks = _chunk_by_chars(text, size=100, overlap=10)
+
+    assert [len(c) for c in chunks] == [100, 100, 70]
+    assert chunks[1][:10] == chunks[0][-10:]
+    assert chunks[0] + chunks[1][10:] + chunks[2][10:] == text
+    assert _chunk_by_chars("short", size=100, overlap=10) == ["short"]
+
+
+def test_collapse_repeats_counts_duplicates_in_order():
+    """Test that repeated entries are merged with a count, keeping first wording."""
+    items = ["Fix typo", "Add search", "fix  typo", "Fix typo", "Add tests"]
+
+    assert _collapse_repeats(items) == ["Fix typo (x3)", "Add search", "Add tests"]
+    assert _collapse_repeats([]) == []
+
+
+def test_summary_cache_round_trip(tmp_path):
+    """Test that cached summaries are stored whole and keyed by prompt."""
+    summarizer = Summarizer.__new__(Summarizer)
+    summarizer.provider = "ollama"
+    summarizer.model_name = "qwen2.5:32b"
+    summarizer.cache_dir = tmp_path / "summary_cache"
+
+    assert summarizer._get_cached_summary("prompt") is None
+
+    summarizer._cache_summary("prompt", "A summary ✓")
+
+    assert summarizer._get_cached_summary("prompt") == "A summary ✓"
+    assert summarizer._get_cached_summary("other prompt") is None
+    assert [p.suffix for p in summarizer.cache_dir.iterdir()] == [".txt"]
+
+
+def test_summarize_session_skips_provider_for_short_cleaned_transcript():
+    """Test that a transcript that cleans down to almost nothing is not sent out."""
+    # No provider is configured, so any provider call would raise
+    summarizer = Summarizer.__new__(Summarizer)
+    transcript = "\x1b[32m\x1b[0m" * 10 + "$ git status\nnothing to commit, working tree clean\n"
+
+    # Transcript text is never echoed back as if it were a summary
+    assert summarizer.summarize_session(transcript) == "Session too short to summarize."
+    assert summarizer.summarize_session("\x1b[0m" * 20) == "Session too short to summarize."
+
+
+def test_summarize_session_whitespace_after_cleaning():
+    """Test that a transcript of escape codes and blank lines is not sent out."""
+    summarizer = Summarizer.__new__(Summarizer)
+    transcript = "\x1b[2K\r   \n\t\x1b[?25h\n" * 10
+
+    assert summarizer.summarize_session(transcript) == "Session too short to summarize."
+
+
+class _VerboseOllama:
+    """Ollama client stand-in that ignores length instructions."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, model, prompt, stream=False):
+        self.calls += 1
+        return {'response': "x" * 50000}
+
+
+def _ollama_summarizer(tmp_path):
+    summarizer = Summarizer.__new__(Summarizer)
+    summarizer.provider = "ollama"
+    summarizer.model_name = "qwen2.5:32b"
+    summarizer.cache_dir = tmp_path / "summary_cache"
+    summarizer.ollama_client = _VerboseOllama()
+    return summarizer
+
+
+class _Chunk:
+    """Streamed Gemini chunk stand-in; text=None behaves like a chunk without text parts."""
+
+    def __init__(self, text):
+        self._text = text
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("The `response.text` quick accessor only works when the response contains a valid `Part`")
+        return self._text
+
+
+class _StreamingGemini:
+    """Gemini model stand-in that streams the given chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def generate_content(self, prompt, stream=False):
+        return iter([_Chunk(text) for text in self.chunks])
+
+
+def _gemini_summarizer(tmp_path, chunks):
+    summarizer = Summarizer.__new__(Summarizer)
+    summarizer.provider = "gemini"
+    summarizer.config = SimpleNamespace(default_model="gemini-2.0-flash")
+    summarizer.cache_dir = tmp_path / "summary_cache"
+    summarizer.model = _StreamingGemini(chunks)
+    return summarizer
+
+
+def test_summarize_session_skips_gemini_chunks_without_text(tmp_path):
+    """Test that streamed chunks without a text part don't fail the summary."""
+    summarizer = _gemini_summarizer(tmp_path, ["Fixed the ", None, "login bug.", None])
+
+    assert summarizer.summarize_session("edited auth.py " * 50) == "Fixed the login bug."
+
+
+def test_summarize_session_does_not_cache_empty_gemini_response(tmp_path):
+    """Test that a stream with no text at all is reported, not cached."""
+    summarizer = _gemini_summarizer(tmp_path, [None])
+    transcript = "edited auth.py " * 50
+
+    assert summarizer.summarize_session(transcript).startswith("Error generating summary")
+
+    summarizer.model = _StreamingGemini(["Fixed the login bug."])
+    assert summarizer.summarize_session(transcript) == "Fixed the login bug."
+
+
+def test_condense_transcript_terminates_with_verbose_model(tmp_path):
+    """Test that condensing shrinks the text even if the model ignores the limit."""
+    summarizer = _ollama_summarizer(tmp_path)
+
+    condensed = summarizer._condense_transcript("word " * 100000)
+
+    assert len(condensed) <= OLLAMA_MAX_TRANSCRIPT_CHARS
+    assert summarizer.ollama_client.calls == 26  # one round of 20k-char parts
+
+
+def test_summarize_session_checks_cache_before_condensing(tmp_path):
+    """Test that a cached long transcript is answered without any provider call."""
+    summarizer = _ollama_summarizer(tmp_path)
+    transcript = "\n".join(f"line {i} of a long session" for i in range(5000))
+    summarizer._cache_summary(Summarizer._session_prompt(transcript, 2000), "Cached summary")
+
+    assert summarizer.summarize_session(transcript) == "Cached summary"
+    assert summarizer.ollama_client.calls == 0
+
+
+def test_summary_cache_prunes_least_recently_used(tmp_path, monkeypatch):
+    """Test that the cache keeps only the most recently used entries."""
+    import os
+    from backend.services import summarizer as summarizer_module
+    monkeypatch.setattr(summarizer_module, 'SUMMARY_CACHE_MAX_ENTRIES', 3)
+    summarizer = _ollama_summarizer(tmp_path)
+
+    for age, prompt in enumerate(["recent", "old", "oldest"]):
+        summarizer._cache_summary(prompt, f"summary {prompt}")
+        path = summarizer._cache_path(prompt)
+        os.utime(path, (1000000 - age * 1000, 1000000 - age * 1000))
+
+    # Reading refreshes "oldest", so "old" is the one pruned next
+    assert summarizer._get_cached_summary("oldest") == "summary oldest"
+    summarizer._cache_summary("new", "summary new")
+
+    assert summarizer._get_cached_summary("old") is None
+    assert summarizer._get_cached_summary("recent") == "summary recent"
+    assert summarizer._get_cached_summary("oldest") == "summary oldest"
+    assert summarizer._get_cached_summary("new") == "summary new"
@@ -0,0 +1,33 @@
+"""Tests for transcript cleaning."""
+
+from backend.utils.transcript_cleaner import clean_transcript
+
+
+def test_clean_transcript_empty():
+    """Test that an empty transcript stays empty."""
+    assert clean_transcript("") == ""
+
+
+def test_clean_transcript_strips_ansi_and_control_chars():
+    """Test that escape sequences and control characters are removed."""
+    raw = "\x1b[32mGreen\x1b[0m text\x07\n\x1b[2KTab\there\x00\x1b[1;1H"
+
+    assert clean_transcript(raw) == "Green text\nTab\there"
+
+
+def test_clean_transcript_collapses_repeated_lines():
+    """Test that runs of identical lines collapse with a repeat marker."""
+    raw = "Working on the build now\n" + "Loading the project files...\n" * 8 + "Finished the build"
+
+    assert clean_transcript(raw).split("\n") == [
+        "Working on the build now",
+        "Loading the project files...",
+        "Loading the project files...",
+        "[... repeated 5 times ...]",
+        "Finished the build",
+    ]
+
+
+def test_clean_transcript_without_escape_sequences():
+    """Test that plain transcripts still lose stray control characters."""
+    assert clean_transcript("plain\x00 text\x08\nnext\tline") == "plain text\nnext\tline"